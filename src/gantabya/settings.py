@@ -7,6 +7,7 @@ Generated by 'django-admin startproject' using Django 5.2.4.
 import os
 from pathlib import Path
 import environ
+from django.core.exceptions import ImproperlyConfigured
 
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
 
@@ -69,6 +70,10 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Per-strategy pricing time in a Server-Timing response header.
+if env.bool("PRICING_SERVER_TIMING", default=False):
+    MIDDLEWARE.append('logistics.middleware.PricingServerTimingMiddleware')
+
 ROOT_URLCONF = 'gantabya.urls'
 
 TEMPLATES = [
@@ -99,8 +104,105 @@ WSGI_APPLICATION = 'gantabya.wsgi.application'
 #     }
 # }
 
+# Cache
+
+# Defaults to process-local memory; point CACHE_URL at redis/memcached in production.
+CACHES = {
+    "default": env.cache("CACHE_URL", default="locmemcache://"),
+    # Price quotes: LRU-culled at MAX_ENTRIES and expired after TIMEOUT seconds.
+    "quotes": env.cache("QUOTE_CACHE_URL", default="locmemcache://quotes?max_entries=10000&timeout=300"),
+    # Rendered carrier load cards; TIMEOUT stays below QUOTE_TOKEN_TTL_SECONDS
+    # so the signed quotes inside a cached card are still usable.
+    "fragments": env.cache("FRAGMENT_CACHE_URL", default="locmemcache://fragments?max_entries=20000&timeout=300"),
+    # Sessions for the cached_db engine; must be shared by every worker
+    # (Redis/Memcached), see below.
+    "sessions": env.cache("SESSION_CACHE_URL", default="locmemcache://sessions?max_entries=50000"),
+}
+
+# Cache backends that are private to one process (locmem) or one host
+# (filecache). Data other workers must see invalidated cannot live there.
+PROCESS_LOCAL_CACHE_BACKENDS = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.filebased.FileBasedCache",
+)
+
+# Sessions
+# Set SESSION_ENGINE=django.contrib.sessions.backends.signed_cookies to keep
+# sessions entirely client-side, or ...backends.cached_db to read through the
+# "sessions" cache and only hit django_session on a miss or a write.
+# cached_db serves hits without asking the database, so a session logged out or
+# rotated on one worker would stay valid (for up to the session age) in
+# another worker's private cache; it therefore needs a shared SESSION_CACHE_URL.
+SESSION_ENGINE = env.str("SESSION_ENGINE", default="django.contrib.sessions.backends.db")
+SESSION_CACHE_ALIAS = "sessions"
+if (
+    SESSION_ENGINE == "django.contrib.sessions.backends.cached_db"
+    and CACHES[SESSION_CACHE_ALIAS]["BACKEND"] in PROCESS_LOCAL_CACHE_BACKENDS
+):
+    raise ImproperlyConfigured(
+        "SESSION_ENGINE=cached_db needs a shared SESSION_CACHE_URL (Redis or "
+        "Memcached); a locmem or file cache keeps logged-out sessions alive "
+        "on other workers."
+    )
+
+# Seconds the cached pending-load counter may drift before it is recounted.
+PENDING_LOAD_COUNT_TTL = env.int("PENDING_LOAD_COUNT_TTL", default=60)
+
+# Search radius for the carrier "loads near me" listing.
+NEARBY_LOADS_RADIUS_KM = env.int("NEARBY_LOADS_RADIUS_KM", default=100)
+
+# In-process pickup grid used for proximity queries when PostGIS is unavailable.
+PICKUP_INDEX_CELL_DEG = env.float("PICKUP_INDEX_CELL_DEG", default=0.25)
+PICKUP_INDEX_TTL = env.int("PICKUP_INDEX_TTL", default=300)
+
+# Serve the carrier listing, detail and booking views with their async versions (ASGI).
+LOGISTICS_ASYNC_VIEWS = env.bool("LOGISTICS_ASYNC_VIEWS", default=False)
+
+# Live load feed (Server-Sent Events). Each open feed holds its connection
+# for as long as the page is open, which only an ASGI server can afford; under
+# WSGI (including runserver) it would pin a worker per carrier page, so the
+# feed stays off unless the site is served by gantabya.asgi.
+# Swap the broker to fan out across processes.
+LOAD_FEED_ENABLED = env.bool("LOAD_FEED_ENABLED", default=False)
+LOGISTICS_EVENT_BROKER = env.str("LOGISTICS_EVENT_BROKER", default="logistics.events.InMemoryBroker")
+LOAD_FEED_HEARTBEAT_SECONDS = env.int("LOAD_FEED_HEARTBEAT_SECONDS", default=15)
+
+# Loads scored per carrier by the matcher, and how long precomputed
+# recommendations (`manage.py precompute_recommendations`) are kept.
+RECOMMENDATION_CANDIDATES = env.int("RECOMMENDATION_CANDIDATES", default=200)
+RECOMMENDATION_TTL = env.int("RECOMMENDATION_TTL", default=900)
+
+# Follow-on loads suggested on the load detail page pick up within
+# CHAIN_PICKUP_RADIUS_KM of the previous destination, up to CHAIN_MAX_DEPTH loads.
+CHAIN_PICKUP_RADIUS_KM = env.int("CHAIN_PICKUP_RADIUS_KM", default=50)
+CHAIN_MAX_DEPTH = env.int("CHAIN_MAX_DEPTH", default=3)
+
+# Road distance table written by `manage.py build_route_table`; enables the
+# "road" pricing strategy. Coordinates farther than ROUTE_SNAP_MAX_KM from
+# any graph node are not priced by road.
+ROUTE_TABLE_PATH = env.str("ROUTE_TABLE_PATH", default="")
+ROUTE_SNAP_MAX_KM = env.float("ROUTE_SNAP_MAX_KM", default=25)
+
+# Lifetime of the signed price quotes carriers book against.
+QUOTE_TOKEN_TTL_SECONDS = env.int("QUOTE_TOKEN_TTL_SECONDS", default=900)
+
+# Serve request.user from a cached snapshot of the fields role checks and
+# pricing read, instead of a user query per request. Snapshots (and the
+# session auth hash in them) live in the default cache and are dropped when
+# the user is saved, so that cache must be shared by every worker: with a
+# process-local one, a password change, deactivation or role change would go
+# unnoticed on other workers for up to USER_SNAPSHOT_TTL seconds.
+USER_SNAPSHOT_CACHE = env.bool("USER_SNAPSHOT_CACHE", default=False)
+USER_SNAPSHOT_TTL = env.int("USER_SNAPSHOT_TTL", default=300)
+if USER_SNAPSHOT_CACHE and CACHES["default"]["BACKEND"] in PROCESS_LOCAL_CACHE_BACKENDS:
+    raise ImproperlyConfigured(
+        "USER_SNAPSHOT_CACHE needs a shared CACHE_URL (Redis or Memcached); "
+        "snapshots in a locmem or file cache are not invalidated on other workers."
+    )
+
+# EmailBackend extends ModelBackend (permissions included), so it is the only
+# backend needed; listing ModelBackend too would add a query to every login.
 AUTHENTICATION_BACKENDS = [
-    "django.contrib.auth.backends.ModelBackend",
     'user_management.backends.EmailBackend',
 ]
 
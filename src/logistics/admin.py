@@ -1,12 +1,31 @@
 from django.contrib import admin
+from .exports import BOOKING_EXPORT_FIELDS, LOAD_EXPORT_FIELDS, export_response
 from .models import Load, Booking
 
 
+def export_action(fields, export_format, basename):
+    """
+    Admin action streaming the selected rows (or the whole filtered
+    changelist, via "select all") as CSV or NDJSON.
+    """
+    def action(modeladmin, request, queryset):
+        return export_response(queryset.order_by("pk"), fields, export_format, basename)
+
+    action.__name__ = f"export_{basename}_{export_format}"
+    action.short_description = f"Export selected {basename} as {export_format.upper()}"
+    return action
+
+
 @admin.register(Load)
 class LoadAdmin(admin.ModelAdmin):
     list_display = ("name", "consignor", "weight", "status", "scheduled_date")
     list_filter = ("status", "scheduled_date")
     search_fields = ("name", "pickup_address", "destination_address")
+    list_select_related = ("consignor",)
+    actions = [
+        export_action(LOAD_EXPORT_FIELDS, "csv", "loads"),
+        export_action(LOAD_EXPORT_FIELDS, "ndjson", "loads"),
+    ]
 
 
 @admin.register(Booking)
@@ -14,3 +33,9 @@ class BookingAdmin(admin.ModelAdmin):
     list_display = ("load", "carrier", "selected_algorithm", "price", "status", "booked_at")
     list_filter = ("selected_algorithm", "status")
     search_fields = ("load__name", "carrier__email")
+    # Booking.load renders via Load.__str__, which reads the consignor.
+    list_select_related = ("load__consignor", "carrier")
+    actions = [
+        export_action(BOOKING_EXPORT_FIELDS, "csv", "bookings"),
+        export_action(BOOKING_EXPORT_FIELDS, "ndjson", "bookings"),
+    ]
@@ -0,0 +1,257 @@
+# logistics/api.py
+
+import hashlib
+from datetime import date
+
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.http import Http404, JsonResponse
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+from django.views import View
+
+from logistics.pricing import pricing_carrier_key, pricing_load_fields
+from logistics.utils import surge_bucket
+from .market import pending_load_count
+from .matching import recommended_loads
+from .mixins import CarrierRequiredMixin
+from .models import Booking, Load
+from .pagination import DEFAULT_PAGE_SIZE, clamp_page_size, keyset_paginate
+from .quotes import get_quotes_batch, sign_quotes
+
+LOAD_FIELDS = (
+    "name",
+    "description",
+    "pickup_address",
+    "pickup_latitude",
+    "pickup_longitude",
+    "destination_address",
+    "destination_latitude",
+    "destination_longitude",
+    "route_distance_km",
+    "weight",
+    "scheduled_date",
+    "status",
+    "created_at",
+    "updated_at",
+)
+
+
+def pricing_fingerprint(carrier):
+    """
+    Every non-load input of pricing_options, so cached responses change with the price.
+    """
+    return (
+        date.today().isoformat(),
+        surge_bucket(pending_load_count()),
+        *pricing_carrier_key(carrier),
+    )
+
+
+def make_etag(*parts):
+    digest = hashlib.md5(repr(parts).encode(), usedforsecurity=False).hexdigest()
+    return quote_etag(digest)
+
+
+class JsonAPIMixin(LoginRequiredMixin):
+    """
+    Shared plumbing for the read-only JSON endpoints: 403 instead of a login
+    redirect, sparse field selection and conditional GET.
+    """
+    raise_exception = True
+    page_size = DEFAULT_PAGE_SIZE
+
+    def get_requested_fields(self, allowed):
+        raw = self.request.GET.get("fields")
+        if not raw:
+            return list(allowed)
+        requested = [field.strip() for field in raw.split(",")]
+        return [field for field in allowed if field in requested]
+
+    def render(self, data, etag, last_modified):
+        response = JsonResponse(data)
+        response["ETag"] = etag
+        if last_modified:
+            response["Last-Modified"] = http_date(last_modified.timestamp())
+        patch_vary_headers(response, ["Cookie"])
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    def not_modified(self, etag, last_modified):
+        """
+        Return a 304 response when the client's copy is current, else None.
+        """
+        response = get_conditional_response(
+            self.request,
+            etag=etag,
+            last_modified=int(last_modified.timestamp()) if last_modified else None,
+        )
+        if response is not None:
+            patch_vary_headers(response, ["Cookie"])
+        return response
+
+
+class LoadAPIMixin(JsonAPIMixin, CarrierRequiredMixin):
+    allowed_fields = ("id", *LOAD_FIELDS, "prices")
+
+    def get_load_queryset(self, fields):
+        columns = {"uuid", "created_at", "updated_at"}
+        columns.update(field for field in fields if field in LOAD_FIELDS)
+        if "prices" in fields:
+            columns.update(pricing_load_fields())
+        return Load.objects.pending().only(*columns)
+
+    def serialize_loads(self, loads, fields):
+        prices = []
+        if "prices" in fields:
+            prices = get_quotes_batch(loads, self.request.user, pending_load_count())
+        results = []
+        for index, load in enumerate(loads):
+            item = {}
+            for field in fields:
+                if field == "id":
+                    item["id"] = load.pk
+                elif field == "prices":
+                    item["prices"] = sign_quotes(load, self.request.user, prices[index])
+                else:
+                    item[field] = getattr(load, field)
+            results.append(item)
+        return results
+
+
+class LoadListAPIView(LoadAPIMixin, View):
+    """
+    Pending loads, newest first, with pricing options for the requesting carrier.
+    Supports ``cursor``, ``page_size`` and ``fields`` query parameters.
+    """
+    def get(self, request, *args, **kwargs):
+        fields = self.get_requested_fields(self.allowed_fields)
+        cursor = request.GET.get("cursor")
+        page_size = request.GET.get("page_size", self.page_size)
+        loads, next_cursor = keyset_paginate(self.get_load_queryset(fields), cursor, page_size)
+
+        # No Last-Modified: a load booked off the page, or a surge/day change
+        # in prices, leaves every remaining updated_at as it was. The ETag
+        # covers page membership and pricing inputs.
+        etag = make_etag(
+            [(str(load.pk), load.updated_at.isoformat()) for load in loads],
+            next_cursor,
+            fields,
+            pricing_fingerprint(request.user) if "prices" in fields else None,
+        )
+        response = self.not_modified(etag, None)
+        if response is not None:
+            return response
+
+        return self.render(
+            {"results": self.serialize_loads(loads, fields), "next_cursor": next_cursor},
+            etag,
+            None,
+        )
+
+
+class LoadDetailAPIView(LoadAPIMixin, View):
+    """
+    A single pending load with pricing options for the requesting carrier.
+    """
+    def get(self, request, *args, **kwargs):
+        fields = self.get_requested_fields(self.allowed_fields)
+        try:
+            load = self.get_load_queryset(fields).get(pk=kwargs["pk"])
+        except Load.DoesNotExist:
+            raise Http404("No pending load found.")
+
+        etag = make_etag(
+            str(load.pk),
+            load.updated_at.isoformat(),
+            fields,
+            pricing_fingerprint(request.user) if "prices" in fields else None,
+        )
+        # Prices move with surge and the day without touching the load.
+        last_modified = None if "prices" in fields else load.updated_at
+        response = self.not_modified(etag, last_modified)
+        if response is not None:
+            return response
+
+        return self.render(self.serialize_loads([load], fields)[0], etag, last_modified)
+
+
+class RecommendedLoadsAPIView(LoadAPIMixin, View):
+    """
+    The requesting carrier's best-matching pending loads, best first, each with
+    its match ``score``. Supports ``limit`` and ``fields`` query parameters.
+    """
+    # Matched loads are fetched with for_listing(), which defers description.
+    allowed_fields = tuple(field for field in LoadAPIMixin.allowed_fields if field != "description")
+
+    def get(self, request, *args, **kwargs):
+        fields = self.get_requested_fields(self.allowed_fields)
+        limit = clamp_page_size(request.GET.get("limit"), default=10)
+        recommendations = recommended_loads(request.user, limit)
+
+        # No Last-Modified, as in LoadListAPIView.
+        etag = make_etag(
+            [(str(load.pk), load.updated_at.isoformat(), score) for score, load in recommendations],
+            fields,
+            pricing_fingerprint(request.user) if "prices" in fields else None,
+        )
+        response = self.not_modified(etag, None)
+        if response is not None:
+            return response
+
+        results = self.serialize_loads([load for _, load in recommendations], fields)
+        for item, (score, _) in zip(results, recommendations):
+            item["score"] = score
+        return self.render({"results": results}, etag, None)
+
+
+class MyBookingsAPIView(JsonAPIMixin, CarrierRequiredMixin, View):
+    """
+    The requesting carrier's bookings, newest first, with a summary of each load.
+    """
+    allowed_fields = (
+        "id", "load", "selected_algorithm", "price", "distance_km", "status", "booked_at",
+    )
+
+    def get(self, request, *args, **kwargs):
+        fields = self.get_requested_fields(self.allowed_fields)
+        cursor = request.GET.get("cursor")
+        page_size = request.GET.get("page_size", self.page_size)
+        queryset = Booking.objects.filter(carrier=request.user).select_related("load")
+        bookings, next_cursor = keyset_paginate(queryset, cursor, page_size)
+
+        last_modified = max(
+            (max(booking.updated_at, booking.load.updated_at) for booking in bookings),
+            default=None,
+        )
+        etag = make_etag(
+            [
+                (str(booking.pk), booking.updated_at.isoformat(), booking.load.updated_at.isoformat())
+                for booking in bookings
+            ],
+            next_cursor,
+            fields,
+        )
+        response = self.not_modified(etag, last_modified)
+        if response is not None:
+            return response
+
+        results = []
+        for booking in bookings:
+            item = {}
+            for field in fields:
+                if field == "id":
+                    item["id"] = booking.pk
+                elif field == "load":
+                    item["load"] = {
+                        "id": booking.load.pk,
+                        "name": booking.load.name,
+                        "pickup_address": booking.load.pickup_address,
+                        "destination_address": booking.load.destination_address,
+                        "weight": booking.load.weight,
+                        "scheduled_date": booking.load.scheduled_date,
+                        "status": booking.load.status,
+                    }
+                else:
+                    item[field] = getattr(booking, field)
+            results.append(item)
+        return self.render({"results": results, "next_cursor": next_cursor}, etag, last_modified)
@@ -4,3 +4,14 @@ from django.apps import AppConfig
 class LogisticsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'logistics'
+
+    def ready(self):
+        from django.conf import settings
+
+        from logistics import signals  # noqa: F401
+
+        if settings.ROUTE_TABLE_PATH:
+            from logistics.pricing import register_strategy
+            from logistics.routing import RoadPricing
+
+            register_strategy(RoadPricing)
@@ -0,0 +1,154 @@
+# logistics/async_views.py
+#
+# Async counterparts of the carrier hot-path views, for deployments served by
+# the ASGI app. Enabled with LOGISTICS_ASYNC_VIEWS; see logistics/urls.py.
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib import messages
+from django.contrib.auth.views import redirect_to_login
+from django.core.exceptions import PermissionDenied
+from django.http import Http404
+from django.shortcuts import redirect
+from django.template.response import TemplateResponse
+from django.views import View
+
+from .chaining import plan_chains
+from .market import apending_load_count
+from .models import Load, PricingAlgorithm
+from .pagination import DEFAULT_PAGE_SIZE, akeyset_paginate
+from .pricing import get_strategy
+from .quotes import get_quotes, sign_quotes
+from .services import BookingError, book_load
+from .spatial import nearest_pending_loads
+from .utils import LoadStatus
+from .views import render_load_cards
+
+
+class AsyncUserMixin:
+    """
+    Resolves request.user with the async auth API and enforces the role.
+    """
+    required_user_type = None
+
+    async def get_user_or_deny(self, request):
+        user = await request.auser()
+        # Later sync code (templates, messages) must not reload the user.
+        request.user = user
+        if not user.is_authenticated:
+            return None
+        if self.required_user_type and user.user_type != self.required_user_type:
+            raise PermissionDenied(f"You must be a {self.required_user_type} to access this page.")
+        return user
+
+
+class AsyncAvailableLoadsView(AsyncUserMixin, View):
+    """
+    Async AvailableLoadsListView. Pricing and card rendering (cache reads
+    that may go to Redis, template rendering) run in a worker thread so they
+    never block the event loop.
+    """
+    required_user_type = 'carrier'
+    template_name = 'logistics/available_loads.html'
+    page_size = DEFAULT_PAGE_SIZE
+
+    async def get(self, request, *args, **kwargs):
+        user = await self.get_user_or_deny(request)
+        if user is None:
+            return redirect_to_login(request.get_full_path())
+
+        cursor = request.GET.get("cursor")
+        near_me = (
+            request.GET.get("near") == "1"
+            and user.current_latitude is not None
+            and user.current_longitude is not None
+        )
+        if near_me:
+            page = sync_to_async(self.get_nearby_page)(user)
+        else:
+            queryset = Load.objects.pending().for_listing()
+            page = akeyset_paginate(queryset, cursor, self.page_size)
+        # Django runs async ORM and cache calls one at a time on its single
+        # sync thread, so awaiting them together would not overlap anything.
+        loads, next_cursor = await page
+        active_count = await apending_load_count()
+        load_cards = await sync_to_async(render_load_cards)(request, loads, user, active_count)
+
+        return TemplateResponse(request, self.template_name, {
+            "loads": loads,
+            "load_cards": load_cards,
+            "next_cursor": next_cursor,
+            "is_first_page": not cursor,
+            "near_me": near_me,
+            "load_feed_enabled": settings.LOAD_FEED_ENABLED,
+        })
+
+    def get_nearby_page(self, user):
+        loads = nearest_pending_loads(
+            user.current_latitude,
+            user.current_longitude,
+            limit=self.page_size,
+            radius_km=settings.NEARBY_LOADS_RADIUS_KM,
+        )
+        return loads, None
+
+
+class AsyncLoadDetailView(AsyncUserMixin, View):
+    """
+    Async LoadDetailView; quoting and chain planning run in a worker thread.
+    """
+    template_name = 'logistics/load_detail.html'
+
+    async def get(self, request, *args, **kwargs):
+        user = await self.get_user_or_deny(request)
+        if user is None:
+            return redirect_to_login(request.get_full_path())
+
+        try:
+            load = await Load.objects.select_related('consignor').aget(pk=kwargs["pk"])
+        except Load.DoesNotExist:
+            raise Http404("No load found matching the query")
+
+        context = {"load": load, "object": load}
+        if user.user_type == 'carrier':
+            active_count = await apending_load_count()
+            context.update(await sync_to_async(self.get_carrier_context)(load, user, active_count))
+        return TemplateResponse(request, self.template_name, context)
+
+    def get_carrier_context(self, load, user, active_count):
+        context = {"price_options": sign_quotes(load, user, get_quotes(load, user, active_count))}
+        if load.status == LoadStatus.PENDING:
+            context["chains"] = plan_chains(user, load)
+        return context
+
+
+class AsyncBookLoadView(AsyncUserMixin, View):
+    """
+    Async BookLoadView; the booking transaction itself runs in a worker thread.
+    """
+    required_user_type = 'carrier'
+
+    async def post(self, request, *args, **kwargs):
+        user = await self.get_user_or_deny(request)
+        if user is None:
+            return redirect_to_login(request.get_full_path())
+
+        try:
+            load = await Load.objects.for_listing().aget(pk=kwargs["pk"])
+        except Load.DoesNotExist:
+            raise Http404("No load found matching the query")
+        selected_algo = request.POST.get("algorithm", PricingAlgorithm.DYNAMIC)
+
+        try:
+            quote_token = request.POST.get(f"quote_{selected_algo}")
+            booking = await sync_to_async(book_load)(load, user, selected_algo, quote_token)
+        except BookingError as e:
+            messages.error(request, str(e))
+            return redirect('available_loads')
+
+        messages.success(
+            request,
+            f"You have successfully booked the load: {load.name} "
+            f"using {get_strategy(selected_algo).label} for NPR {booking.price}.",
+        )
+        return redirect('my_bookings')
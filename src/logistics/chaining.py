@@ -0,0 +1,94 @@
+"""
+Backhaul chaining: follow-on pending loads a carrier could pick up near the
+destination of the load they are looking at.
+
+Chains are grown level by level with a beam search. Each level finds the
+candidates near every chain end with a single query (see
+``nearest_pending_loads_for_each``), so a plan of depth N costs N queries.
+"""
+
+from collections import namedtuple
+
+from django.conf import settings
+
+from logistics.spatial import nearest_pending_loads_for_each
+
+# Follow-on loads tried per chain end, and partial chains kept per level.
+CHAIN_BRANCHING = 5
+CHAIN_BEAM = 20
+
+Chain = namedtuple("Chain", ["loads", "total_weight", "deadhead_km"])
+
+
+def _has_destination(load):
+    return load.destination_latitude is not None and load.destination_longitude is not None
+
+
+def plan_chains(carrier, first_load, depth=None, radius_km=None, limit=5):
+    """
+    Return up to ``limit`` Chains starting with ``first_load``, longest and
+    then least deadhead first.
+
+    Each follow-on load is pending, picks up within ``radius_km`` of the
+    previous destination, is not scheduled before the previous load, and keeps
+    the total weight within the carrier's capacity. ``Chain.loads[1:]`` are
+    the follow-on loads; ``deadhead_km`` sums the empty legs between them.
+    """
+    depth = depth or settings.CHAIN_MAX_DEPTH
+    radius_km = radius_km or settings.CHAIN_PICKUP_RADIUS_KM
+    capacity = float(carrier.vehicle_capacity_kg) if carrier.vehicle_capacity_kg else float("inf")
+    if not _has_destination(first_load) or float(first_load.weight) > capacity:
+        return []
+
+    frontier = [Chain((first_load,), float(first_load.weight), 0.0)]
+    planned = []
+    for _ in range(depth):
+        # Over-fetch so loads filtered out below do not starve the branch.
+        nearby = nearest_pending_loads_for_each(
+            {
+                chain.loads[-1].pk: (
+                    chain.loads[-1].destination_latitude,
+                    chain.loads[-1].destination_longitude,
+                )
+                for chain in frontier
+            },
+            limit=CHAIN_BRANCHING * 4,
+            radius_km=radius_km,
+        )
+
+        extended = []
+        for chain in frontier:
+            end = chain.loads[-1]
+            in_chain = {load.pk for load in chain.loads}
+            branches = 0
+            for load in nearby[end.pk]:
+                if load.pk in in_chain or not _has_destination(load):
+                    continue
+                if end.scheduled_date and load.scheduled_date and load.scheduled_date < end.scheduled_date:
+                    continue
+                total_weight = chain.total_weight + float(load.weight)
+                if total_weight > capacity:
+                    continue
+                extended.append(Chain(
+                    chain.loads + (load,),
+                    total_weight,
+                    round(chain.deadhead_km + load.pickup_distance.km, 2),
+                ))
+                branches += 1
+                if branches == CHAIN_BRANCHING:
+                    break
+        if not extended:
+            break
+        extended.sort(key=lambda chain: chain.deadhead_km)
+        frontier = extended[:CHAIN_BEAM]
+        planned.extend(frontier)
+
+    # Drop chains that are just the start of a longer planned chain.
+    prefixes = {
+        tuple(load.pk for load in chain.loads[:length])
+        for chain in planned
+        for length in range(2, len(chain.loads))
+    }
+    planned = [chain for chain in planned if tuple(load.pk for load in chain.loads) not in prefixes]
+    planned.sort(key=lambda chain: (-len(chain.loads), chain.deadhead_km))
+    return planned[:limit]
@@ -0,0 +1,223 @@
+"""
+Dispatch: assign many pending loads to many available carriers at once,
+minimising the total deadhead (carrier position to pickup) distance without
+exceeding any carrier's capacity.
+
+Small instances are solved exactly with SciPy's Hungarian implementation when
+SciPy is installed (the ``dispatch`` extra). Larger ones (or without SciPy)
+use a greedy pass over each carrier's nearest feasible pickups, which keeps
+memory linear in the number of carriers.
+"""
+
+import heapq
+from collections import namedtuple
+
+from django.contrib.auth import get_user_model
+
+from logistics.models import Load
+from logistics.spatial import GridIndex
+from logistics.utils import LoadStatus
+
+try:
+    import numpy as np
+except ImportError:  # Installed with the project; without it the greedy solver uses the grid index.
+    np = None
+
+try:
+    from scipy.optimize import linear_sum_assignment
+except ImportError:  # The "dispatch" extra; without it every instance is solved greedily.
+    linear_sum_assignment = None
+
+# Largest carriers x loads matrix handed to the Hungarian solver (about 16 MB).
+HUNGARIAN_MAX_CELLS = 2_000_000
+# Pickups considered per carrier by the greedy solver.
+GREEDY_CANDIDATES = 20
+# Carrier rows costed per chunk, bounding the greedy solver's matrix memory.
+CHUNK_ROWS = 512
+EARTH_RADIUS_KM = 6371
+
+Assignment = namedtuple("Assignment", ["carrier", "load", "deadhead_km"])
+
+
+class DispatchError(Exception):
+    """
+    Raised when the requested solver cannot run.
+    """
+
+
+def available_carriers():
+    """
+    Active carriers with a known position and no load booked or in transit.
+    """
+    return (
+        get_user_model().objects
+        .filter(
+            user_type="carrier",
+            is_active=True,
+            current_latitude__isnull=False,
+            current_longitude__isnull=False,
+        )
+        .exclude(bookings__load__status__in=[LoadStatus.BOOKED, LoadStatus.IN_TRANSIT])
+        .distinct()
+    )
+
+
+def assignable_loads():
+    return Load.objects.pending().for_pricing().filter(
+        pickup_latitude__isnull=False,
+        pickup_longitude__isnull=False,
+    )
+
+
+def _capacity(carrier):
+    # Carriers without a stated capacity are treated as able to take any load.
+    return float(carrier.vehicle_capacity_kg) if carrier.vehicle_capacity_kg else float("inf")
+
+
+def _deadhead_matrix(carriers, loads):
+    """
+    Vectorized haversine from every carrier position to every pickup, with
+    infeasible (over-capacity) pairs set to inf.
+    """
+    carrier_coords = np.radians(np.array(
+        [(c.current_latitude, c.current_longitude) for c in carriers], dtype=float
+    ))
+    load_coords = np.radians(np.array(
+        [(load.pickup_latitude, load.pickup_longitude) for load in loads], dtype=float
+    ))
+    lat1 = carrier_coords[:, 0:1]
+    lon1 = carrier_coords[:, 1:2]
+    lat2 = load_coords[:, 0]
+    lon2 = load_coords[:, 1]
+    a = (
+        np.sin((lat2 - lat1) / 2) ** 2
+        + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    )
+    cost = EARTH_RADIUS_KM * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+    capacities = np.array([_capacity(c) for c in carriers])
+    weights = np.array([float(load.weight) for load in loads])
+    cost[weights[None, :] > capacities[:, None]] = np.inf
+    return cost
+
+
+def _solve_hungarian(carriers, loads, max_deadhead_km):
+    cost = _deadhead_matrix(carriers, loads)
+    if max_deadhead_km is not None:
+        cost[cost > max_deadhead_km] = np.inf
+    feasible = np.isfinite(cost)
+    # linear_sum_assignment needs finite costs; forbidden pairs get a cost no
+    # real assignment can reach and are dropped afterwards.
+    forbidden = (cost[feasible].max() if feasible.any() else 0) * (len(carriers) + 1) + 1
+    rows, cols = linear_sum_assignment(np.where(feasible, cost, forbidden))
+    return [(float(cost[i, j]), i, j) for i, j in zip(rows.tolist(), cols.tolist()) if feasible[i, j]]
+
+
+def _candidate_pairs_numpy(carriers, loads, max_deadhead_km):
+    k = min(GREEDY_CANDIDATES, len(loads))
+    pairs = []
+    for start in range(0, len(carriers), CHUNK_ROWS):
+        cost = _deadhead_matrix(carriers[start:start + CHUNK_ROWS], loads)
+        nearest = np.argpartition(cost, k - 1, axis=1)[:, :k]
+        nearest_cost = np.take_along_axis(cost, nearest, axis=1)
+        for row, (cols, costs) in enumerate(zip(nearest.tolist(), nearest_cost.tolist())):
+            for col, km in zip(cols, costs):
+                if km != float("inf") and (max_deadhead_km is None or km <= max_deadhead_km):
+                    pairs.append((km, start + row, col))
+    return pairs
+
+
+def _candidate_pairs_grid(carriers, loads, max_deadhead_km):
+    index = GridIndex()
+    for col, load in enumerate(loads):
+        index.insert(col, load.pickup_latitude, load.pickup_longitude)
+    pairs = []
+    for row, carrier in enumerate(carriers):
+        capacity = _capacity(carrier)
+        # Over-fetch so over-capacity pickups do not crowd out feasible ones.
+        nearest = index.nearest(
+            carrier.current_latitude,
+            carrier.current_longitude,
+            k=GREEDY_CANDIDATES * 2,
+            max_km=max_deadhead_km,
+        )
+        feasible = [(km, col) for km, col in nearest if float(loads[col].weight) <= capacity]
+        pairs.extend((km, row, col) for km, col in feasible[:GREEDY_CANDIDATES])
+    return pairs
+
+
+def _greedy_round(carriers, loads, max_deadhead_km):
+    if np is not None:
+        pairs = _candidate_pairs_numpy(carriers, loads, max_deadhead_km)
+    else:
+        pairs = _candidate_pairs_grid(carriers, loads, max_deadhead_km)
+    heapq.heapify(pairs)
+
+    used_carriers, used_loads, chosen = set(), set(), []
+    while pairs and len(used_carriers) < len(carriers) and len(used_loads) < len(loads):
+        km, row, col = heapq.heappop(pairs)
+        if row in used_carriers or col in used_loads:
+            continue
+        used_carriers.add(row)
+        used_loads.add(col)
+        chosen.append((km, row, col))
+    return chosen
+
+
+def _solve_greedy(carriers, loads, max_deadhead_km):
+    """
+    Take candidate pairs shortest deadhead first, skipping carriers and loads
+    already assigned. Carriers whose candidates were all taken get another
+    round against the loads still open, until a round assigns nothing.
+    """
+    carrier_rows = list(range(len(carriers)))
+    load_cols = list(range(len(loads)))
+    chosen = []
+    while carrier_rows and load_cols:
+        assigned = _greedy_round(
+            [carriers[row] for row in carrier_rows],
+            [loads[col] for col in load_cols],
+            max_deadhead_km,
+        )
+        if not assigned:
+            break
+        chosen.extend((km, carrier_rows[row], load_cols[col]) for km, row, col in assigned)
+        taken_rows = {row for _, row, _ in assigned}
+        taken_cols = {col for _, _, col in assigned}
+        carrier_rows = [r for i, r in enumerate(carrier_rows) if i not in taken_rows]
+        load_cols = [c for i, c in enumerate(load_cols) if i not in taken_cols]
+    return chosen
+
+
+def assign_loads(carriers, loads, max_deadhead_km=None, method="auto"):
+    """
+    Match carriers to loads, at most one load per carrier, and return a list
+    of Assignment tuples sorted by deadhead.
+
+    ``method`` is "hungarian" (exact; needs NumPy and SciPy), "greedy", or
+    "auto" to use the exact solver when the instance is small enough.
+    """
+    carriers, loads = list(carriers), list(loads)
+    if not carriers or not loads:
+        return []
+
+    exact_available = np is not None and linear_sum_assignment is not None
+    if method == "hungarian" and not exact_available:
+        raise DispatchError("The Hungarian solver needs NumPy and SciPy installed.")
+    if method == "auto":
+        small = len(carriers) * len(loads) <= HUNGARIAN_MAX_CELLS
+        method = "hungarian" if exact_available and small else "greedy"
+
+    if method == "hungarian":
+        chosen = _solve_hungarian(carriers, loads, max_deadhead_km)
+    else:
+        chosen = _solve_greedy(carriers, loads, max_deadhead_km)
+
+    return sorted(
+        (Assignment(carriers[row], loads[col], round(km, 2)) for km, row, col in chosen),
+        key=lambda assignment: assignment.deadhead_km,
+    )
+
+
+def total_deadhead_km(assignments):
+    return round(sum(assignment.deadhead_km for assignment in assignments), 2)
@@ -0,0 +1,107 @@
+import asyncio
+import threading
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+LOAD_CREATED = "load.created"
+LOAD_BOOKED = "load.booked"
+LOAD_CANCELLED = "load.cancelled"
+
+
+class Subscription:
+    """
+    One listener's queue of events. ``get()`` must be awaited on the event
+    loop the subscription was created on.
+    """
+
+    def __init__(self, broker, loop, max_queue_size):
+        self.broker = broker
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=max_queue_size)
+
+    async def get(self):
+        return await self.queue.get()
+
+    def deliver(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            pass  # a stalled client drops events rather than holding memory
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class BaseBroker:
+    """
+    Fan-out of load events to feed subscribers. Implement this interface to
+    relay events between processes (e.g. Redis pub/sub).
+    """
+
+    def publish(self, event):
+        raise NotImplementedError
+
+    def subscribe(self):
+        raise NotImplementedError
+
+    def unsubscribe(self, subscription):
+        raise NotImplementedError
+
+
+class InMemoryBroker(BaseBroker):
+    """
+    In-process pub/sub. Only listeners connected to the publishing process
+    see an event.
+    """
+
+    def __init__(self, max_queue_size=100):
+        self.max_queue_size = max_queue_size
+        self._subscriptions = set()
+        self._lock = threading.Lock()
+
+    def publish(self, event):
+        """
+        Deliver an event to every subscriber; safe to call from any thread.
+        """
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.deliver, event)
+            except RuntimeError:  # the subscriber's loop has shut down
+                self.unsubscribe(subscription)
+
+    def subscribe(self):
+        subscription = Subscription(self, asyncio.get_running_loop(), self.max_queue_size)
+        with self._lock:
+            self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscriptions.discard(subscription)
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    """
+    The process-wide broker configured by LOGISTICS_EVENT_BROKER.
+    """
+    global _broker
+    with _broker_lock:
+        if _broker is None:
+            _broker = import_string(settings.LOGISTICS_EVENT_BROKER)()
+        return _broker
+
+
+def publish_load_event(event_type, load):
+    get_broker().publish({
+        "type": event_type,
+        "id": str(load.pk),
+        "status": load.status,
+        "updated_at": load.updated_at.isoformat() if load.updated_at else None,
+    })
@@ -0,0 +1,70 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from logistics.dispatch import (
+    DispatchError,
+    assign_loads,
+    assignable_loads,
+    available_carriers,
+    total_deadhead_km,
+)
+from logistics.pricing import get_strategies, pricing_carrier_fields
+from logistics.services import BookingError, book_assignments
+from logistics.utils import PricingAlgorithm
+
+
+class Command(BaseCommand):
+    help = (
+        "Assign pending loads to available carriers, minimising total deadhead distance "
+        "within vehicle capacity. Prints the plan; pass --book to create the bookings."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--method", choices=["auto", "hungarian", "greedy"], default="auto")
+        parser.add_argument("--max-deadhead-km", type=float, default=None)
+        parser.add_argument("--book", action="store_true", help="Create bookings for the assignments.")
+        parser.add_argument(
+            "--algorithm",
+            default=PricingAlgorithm.DYNAMIC,
+            choices=[strategy.key for strategy in get_strategies()],
+            help="Pricing strategy used for created bookings.",
+        )
+
+    def handle(self, *args, **options):
+        carriers = available_carriers().only(
+            "pk",
+            "email",
+            "vehicle_capacity_kg",
+            "current_latitude",
+            "current_longitude",
+            *pricing_carrier_fields(),
+        )
+        started = time.monotonic()
+        try:
+            assignments = assign_loads(
+                carriers,
+                assignable_loads(),
+                max_deadhead_km=options["max_deadhead_km"],
+                method=options["method"],
+            )
+        except DispatchError as e:
+            raise CommandError(str(e))
+        elapsed = time.monotonic() - started
+
+        if options["verbosity"] > 1:
+            for assignment in assignments:
+                self.stdout.write(
+                    f"{assignment.carrier.email} -> {assignment.load.pk} ({assignment.deadhead_km} km)"
+                )
+        self.stdout.write(
+            f"Assigned {len(assignments)} loads, total deadhead "
+            f"{total_deadhead_km(assignments)} km, in {elapsed:.2f}s."
+        )
+
+        if options["book"]:
+            try:
+                bookings = book_assignments(assignments, options["algorithm"])
+            except BookingError as e:
+                raise CommandError(str(e))
+            self.stdout.write(self.style.SUCCESS(f"Created {len(bookings)} bookings."))
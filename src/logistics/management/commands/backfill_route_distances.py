@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand
+
+from logistics.models import Load
+from logistics.utils import haversine_distance_km
+
+
+class Command(BaseCommand):
+    help = "Compute route_distance_km for loads that have coordinates but no stored distance."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        queryset = (
+            Load.objects.filter(route_distance_km__isnull=True)
+            .exclude(pickup_latitude__isnull=True)
+            .exclude(pickup_longitude__isnull=True)
+            .exclude(destination_latitude__isnull=True)
+            .exclude(destination_longitude__isnull=True)
+            .only("pk", *Load.COORDINATE_FIELDS)
+        )
+
+        updated = 0
+        batch = []
+        for load in queryset.iterator(chunk_size=batch_size):
+            load.route_distance_km = haversine_distance_km(
+                load.pickup_latitude,
+                load.pickup_longitude,
+                load.destination_latitude,
+                load.destination_longitude,
+            )
+            batch.append(load)
+            if len(batch) >= batch_size:
+                updated += Load.objects.bulk_update(batch, ["route_distance_km"])
+                batch = []
+        if batch:
+            updated += Load.objects.bulk_update(batch, ["route_distance_km"])
+
+        self.stdout.write(self.style.SUCCESS(f"Backfilled route distance for {updated} loads."))
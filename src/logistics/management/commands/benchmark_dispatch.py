@@ -0,0 +1,85 @@
+import random
+import time
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from logistics import dispatch
+from logistics.dispatch import assign_loads, total_deadhead_km
+from logistics.models import Load
+
+# Roughly Nepal's bounding box.
+LATITUDES = (26.3, 30.4)
+LONGITUDES = (80.0, 88.2)
+
+
+def synthetic_instance(carriers_count, loads_count, seed=0):
+    """
+    Unsaved carriers and loads; about one carrier in ten is too small for the heaviest loads.
+    """
+    rng = random.Random(seed)
+    User = get_user_model()
+    carriers = [
+        User(
+            email=f"carrier{i}@benchmark.invalid",
+            user_type="carrier",
+            current_latitude=rng.uniform(*LATITUDES),
+            current_longitude=rng.uniform(*LONGITUDES),
+            vehicle_capacity_kg=Decimal(rng.choice([1000, 5000, 10000, 20000])),
+        )
+        for i in range(carriers_count)
+    ]
+    loads = [
+        Load(
+            name=f"Benchmark {i}",
+            weight=Decimal(rng.randint(100, 12000)),
+            pickup_latitude=rng.uniform(*LATITUDES),
+            pickup_longitude=rng.uniform(*LONGITUDES),
+        )
+        for i in range(loads_count)
+    ]
+    return carriers, loads
+
+
+class Command(BaseCommand):
+    help = (
+        "Time the dispatch solvers on synthetic carriers x loads instances. Sizes are "
+        "given as CARRIERSxLOADS. Touches no tables."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", nargs="+", default=["1000x1000", "10000x10000"])
+        parser.add_argument(
+            "--methods",
+            nargs="+",
+            choices=["hungarian", "greedy"],
+            default=["hungarian", "greedy"],
+        )
+
+    def handle(self, *args, **options):
+        exact_available = dispatch.np is not None and dispatch.linear_sum_assignment is not None
+        for size in options["sizes"]:
+            carriers_count, loads_count = (int(part) for part in size.lower().split("x"))
+            carriers, loads = synthetic_instance(carriers_count, loads_count)
+            for method in options["methods"]:
+                if method == "hungarian" and (
+                    not exact_available
+                    or carriers_count * loads_count > dispatch.HUNGARIAN_MAX_CELLS
+                ):
+                    self.stdout.write(
+                        f"{size} {method}: skipped (needs SciPy and at most "
+                        f"{dispatch.HUNGARIAN_MAX_CELLS} cells)."
+                    )
+                    continue
+                started = time.perf_counter()
+                assignments = assign_loads(carriers, loads, method=method)
+                elapsed = time.perf_counter() - started
+                total_km = total_deadhead_km(assignments)
+                # The solvers may assign different numbers of loads, so the mean
+                # deadhead is the comparable figure.
+                mean_km = total_km / len(assignments) if assignments else 0
+                self.stdout.write(
+                    f"{size} {method}: {elapsed:.2f}s, {len(assignments)} assigned, "
+                    f"total deadhead {total_km:.0f} km, mean {mean_km:.1f} km."
+                )
@@ -0,0 +1,73 @@
+import heapq
+import random
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from logistics.spatial import GridIndex
+from logistics.utils import haversine_distance_km
+
+# Roughly Nepal's bounding box.
+LATITUDES = (26.3, 30.4)
+LONGITUDES = (80.0, 88.2)
+
+
+def brute_force_nearest(points, latitude, longitude, k, max_km):
+    distances = (
+        (haversine_distance_km(latitude, longitude, lat, lon), key)
+        for key, (lat, lon) in points.items()
+    )
+    return heapq.nsmallest(k, (pair for pair in distances if pair[0] <= max_km))
+
+
+class Command(BaseCommand):
+    help = "Compare GridIndex.nearest with a brute-force haversine scan over synthetic pickups. Touches no tables."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--points", type=int, default=50_000)
+        parser.add_argument("--queries", type=int, default=200)
+        parser.add_argument("--k", type=int, default=20)
+        parser.add_argument("--radius-km", type=float, default=settings.NEARBY_LOADS_RADIUS_KM)
+        parser.add_argument("--cell-deg", type=float, default=settings.PICKUP_INDEX_CELL_DEG)
+
+    def handle(self, *args, **options):
+        rng = random.Random(0)
+        points = {
+            key: (rng.uniform(*LATITUDES), rng.uniform(*LONGITUDES))
+            for key in range(options["points"])
+        }
+        queries = [
+            (rng.uniform(*LATITUDES), rng.uniform(*LONGITUDES))
+            for _ in range(options["queries"])
+        ]
+        k, max_km = options["k"], options["radius_km"]
+
+        started = time.perf_counter()
+        index = GridIndex(options["cell_deg"])
+        for key, (lat, lon) in points.items():
+            index.insert(key, lat, lon)
+        build_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        grid_results = [index.nearest(lat, lon, k=k, max_km=max_km) for lat, lon in queries]
+        grid_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        brute_results = [brute_force_nearest(points, lat, lon, k, max_km) for lat, lon in queries]
+        brute_seconds = time.perf_counter() - started
+
+        # Distances are rounded to 0.01 km, so a tie at the k-th place may keep
+        # a different key; compare the distances only.
+        matches = all(
+            [km for km, _ in grid] == [km for km, _ in brute]
+            for grid, brute in zip(grid_results, brute_results)
+        )
+        self.stdout.write(
+            f"{len(points)} pickups, {len(queries)} queries (k={k}, radius {max_km:g} km): "
+            f"index build {build_seconds * 1000:.0f}ms, "
+            f"grid {grid_seconds / len(queries) * 1000:.2f}ms/query, "
+            f"brute force {brute_seconds / len(queries) * 1000:.2f}ms/query "
+            f"({brute_seconds / grid_seconds:.0f}x), "
+            f"distances {'identical' if matches else 'DIFFER'}."
+        )
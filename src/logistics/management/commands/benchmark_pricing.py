@@ -0,0 +1,77 @@
+import random
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from logistics.models import Load
+from logistics.pricing import get_strategies, pricing_options_batch
+
+
+def synthetic_loads(count, seed=0):
+    """
+    Unsaved loads around Kathmandu; half of them carry a stored route distance.
+    """
+    rng = random.Random(seed)
+    today = date.today()
+    return [
+        Load(
+            name=f"Benchmark {i}",
+            weight=Decimal(rng.randint(50, 5000)),
+            pickup_latitude=27.7 + rng.random(),
+            pickup_longitude=85.3 + rng.random(),
+            destination_latitude=28.2 + rng.random(),
+            destination_longitude=83.9 + rng.random(),
+            route_distance_km=float(rng.randint(50, 400)) if i % 2 else None,
+            scheduled_date=today + timedelta(days=rng.randint(0, 10)),
+        )
+        for i in range(count)
+    ]
+
+
+def scalar_pricing(loads, carrier, active_loads_count):
+    strategies = get_strategies()
+    return [
+        {
+            strategy.key: {"label": strategy.label, **strategy.quote(load, carrier, active_loads_count)}
+            for strategy in strategies
+        }
+        for load in loads
+    ]
+
+
+class Command(BaseCommand):
+    help = "Compare pricing_options_batch with a per-load scalar loop over synthetic loads. Touches no tables."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+        parser.add_argument("--repeat", type=int, default=3, help="Best of N runs.")
+
+    def handle(self, *args, **options):
+        carrier = get_user_model()(
+            user_type="carrier",
+            vehicle_capacity_kg=Decimal("2000"),
+            base_rate_per_km=Decimal("80"),
+        )
+        active_loads_count = 12
+
+        for size in options["sizes"]:
+            loads = synthetic_loads(size)
+            timings = {}
+            for name, price in (("scalar", scalar_pricing), ("batch", pricing_options_batch)):
+                best = float("inf")
+                for _ in range(options["repeat"]):
+                    started = time.perf_counter()
+                    result = price(loads, carrier, active_loads_count)
+                    best = min(best, time.perf_counter() - started)
+                timings[name] = (best, result)
+
+            matches = timings["scalar"][1] == timings["batch"][1]
+            self.stdout.write(
+                f"{size} loads: scalar {timings['scalar'][0] * 1000:.0f}ms, "
+                f"batch {timings['batch'][0] * 1000:.0f}ms "
+                f"({timings['scalar'][0] / timings['batch'][0]:.1f}x), "
+                f"results {'identical' if matches else 'DIFFER'}."
+            )
@@ -0,0 +1,74 @@
+import asyncio
+import statistics
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.test import AsyncClient, Client
+from django.test.utils import override_settings
+from django.urls import reverse
+
+from logistics.models import Load
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure requests/sec and latency percentiles of the carrier listing and detail "
+        "pages through the ASGI handler. Run once with LOGISTICS_ASYNC_VIEWS=True and once "
+        "without to compare the async and sync views."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--carrier", required=True, help="Email of an existing carrier to browse as.")
+        parser.add_argument("--requests", type=int, default=500)
+        parser.add_argument("--concurrency", type=int, default=20)
+
+    def handle(self, *args, **options):
+        try:
+            carrier = get_user_model().objects.get(email__iexact=options["carrier"], user_type="carrier")
+        except get_user_model().DoesNotExist:
+            raise CommandError(f"No carrier with email {options['carrier']}.")
+        load = Load.objects.pending().order_by("-created_at").first()
+        if load is None:
+            raise CommandError("There are no pending loads to browse.")
+        paths = [reverse("available_loads"), reverse("load_detail", args=[load.pk])]
+
+        with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]):
+            session = Client()
+            session.force_login(carrier)
+            try:
+                latencies, errors, elapsed = asyncio.run(
+                    self.run(paths, session.cookies, options["requests"], options["concurrency"])
+                )
+            finally:
+                session.logout()
+
+        latencies.sort()
+        p50, p99 = (statistics.quantiles(latencies, n=100)[i] for i in (49, 98))
+        mode = "async" if settings.LOGISTICS_ASYNC_VIEWS else "sync"
+        self.stdout.write(
+            f"{mode} views, {len(latencies)} requests, concurrency {options['concurrency']}: "
+            f"{len(latencies) / elapsed:.1f} req/s, p50 {p50 * 1000:.1f}ms, "
+            f"p99 {p99 * 1000:.1f}ms, {errors} errors."
+        )
+
+    async def run(self, paths, cookies, total, concurrency):
+        latencies = []
+        errors = 0
+        pending = iter(range(total))
+
+        async def worker():
+            nonlocal errors
+            client = AsyncClient()
+            client.cookies = cookies
+            for number in pending:
+                started = time.perf_counter()
+                response = await client.get(paths[number % len(paths)])
+                latencies.append(time.perf_counter() - started)
+                if response.status_code != 200:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return latencies, errors, time.perf_counter() - started
@@ -0,0 +1,35 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from logistics.routing import RouteTableError, build_route_table, load_graph
+
+
+class Command(BaseCommand):
+    help = "Precompute the road distance table used by the road pricing strategy from a JSON road graph."
+
+    def add_arguments(self, parser):
+        parser.add_argument("graph", help="Path to the JSON road graph.")
+        parser.add_argument(
+            "--output",
+            default=None,
+            help="Where to write the table (defaults to ROUTE_TABLE_PATH).",
+        )
+
+    def handle(self, *args, **options):
+        output = options["output"] or settings.ROUTE_TABLE_PATH
+        if not output:
+            raise CommandError("Set ROUTE_TABLE_PATH or pass --output.")
+
+        started = time.monotonic()
+        try:
+            nodes, adjacency = load_graph(options["graph"])
+            build_route_table(nodes, adjacency, output)
+        except RouteTableError as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote route table for {len(nodes)} nodes to {output} "
+            f"in {time.monotonic() - started:.1f}s."
+        ))
@@ -0,0 +1,42 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.management.base import BaseCommand, CommandError
+
+from logistics.market import pending_load_count
+from logistics.matching import store_recommendations
+from logistics.pricing import pricing_carrier_fields
+
+
+class Command(BaseCommand):
+    help = "Precompute and cache load recommendations for every active carrier. Run periodically."
+
+    def handle(self, *args, **options):
+        if isinstance(caches["default"], LocMemCache):
+            # The command's own process memory is discarded when it exits.
+            raise CommandError(
+                "The default cache is process-local memory; set CACHE_URL to a "
+                "shared cache (Redis, Memcached or a file cache) so the web "
+                "workers can read the precomputed recommendations."
+            )
+
+        carriers = (
+            get_user_model().objects
+            .filter(user_type="carrier", is_active=True)
+            .only(
+                "pk",
+                "vehicle_capacity_kg",
+                "current_latitude",
+                "current_longitude",
+                *pricing_carrier_fields(),
+            )
+        )
+        # One market snapshot for the whole run keeps quotes consistent across carriers.
+        active_loads_count = pending_load_count()
+
+        count = 0
+        for carrier in carriers.iterator(chunk_size=500):
+            store_recommendations(carrier, active_loads_count=active_loads_count)
+            count += 1
+
+        self.stdout.write(self.style.SUCCESS(f"Stored recommendations for {count} carriers."))
@@ -0,0 +1,56 @@
+from django.contrib.gis.db.models.functions import Distance
+from django.contrib.gis.geos import Point
+from django.contrib.gis.measure import D
+from django.db import models
+
+from logistics.pricing import pricing_load_fields
+from logistics.utils import LoadStatus
+
+
+# Columns shown on carrier listings; skips description and geometries.
+LISTING_FIELDS = (
+    "uuid",
+    "name",
+    "pickup_address",
+    "destination_address",
+    "pickup_latitude",
+    "pickup_longitude",
+    "destination_latitude",
+    "destination_longitude",
+    "route_distance_km",
+    "weight",
+    "scheduled_date",
+    "status",
+    "created_at",
+    "updated_at",
+)
+# Columns every priced queryset needs besides the strategies' own fields.
+PRICING_BASE_FIELDS = ("uuid", "status", "updated_at")
+
+
+class LoadQuerySet(models.QuerySet):
+    def pending(self):
+        return self.filter(status=LoadStatus.PENDING)
+
+    def for_listing(self):
+        return self.only(*LISTING_FIELDS, *pricing_load_fields())
+
+    def for_pricing(self):
+        """
+        Only the columns the registered pricing strategies read.
+        """
+        return self.only(*PRICING_BASE_FIELDS, *pricing_load_fields())
+
+    def nearest_pickups(self, latitude, longitude, radius_km=None):
+        """
+        Order loads by pickup distance from a point, nearest first.
+        Rows are annotated with ``pickup_distance``; ``radius_km`` adds an
+        ST_DWithin filter that is answered from the GiST index on pickup_point.
+        """
+        origin = Point(longitude, latitude, srid=4326)
+        queryset = self.filter(pickup_point__isnull=False)
+        if radius_km:
+            queryset = queryset.filter(pickup_point__dwithin=(origin, D(km=radius_km)))
+        return queryset.annotate(
+            pickup_distance=Distance("pickup_point", origin)
+        ).order_by("pickup_distance")
@@ -0,0 +1,53 @@
+from django.conf import settings
+from django.core.cache import cache
+
+from logistics.utils import LoadStatus
+
+PENDING_LOAD_COUNT_KEY = "logistics:pending-load-count"
+
+
+def pending_load_count():
+    """
+    Number of pending loads, used as the surge input of dynamic_pricing().
+    Served from the cache and recounted at most once per PENDING_LOAD_COUNT_TTL.
+    """
+    count = cache.get(PENDING_LOAD_COUNT_KEY)
+    if count is None:
+        from logistics.models import Load
+
+        count = Load.objects.filter(status=LoadStatus.PENDING).count()
+        cache.set(PENDING_LOAD_COUNT_KEY, count, settings.PENDING_LOAD_COUNT_TTL)
+    return count
+
+
+async def apending_load_count():
+    """
+    Async version of ``pending_load_count``.
+    """
+    count = await cache.aget(PENDING_LOAD_COUNT_KEY)
+    if count is None:
+        from logistics.models import Load
+
+        count = await Load.objects.filter(status=LoadStatus.PENDING).acount()
+        await cache.aset(PENDING_LOAD_COUNT_KEY, count, settings.PENDING_LOAD_COUNT_TTL)
+    return count
+
+
+def adjust_pending_load_count(delta):
+    """
+    Apply an incremental change to the cached counter.
+    If the counter is not cached, the next read recounts from the database.
+    """
+    if not delta:
+        return
+    try:
+        cache.incr(PENDING_LOAD_COUNT_KEY, delta)
+    except ValueError:
+        pass
+
+
+def reset_pending_load_count():
+    """
+    Drop the cached counter so the next read recounts from the database.
+    """
+    cache.delete(PENDING_LOAD_COUNT_KEY)
@@ -0,0 +1,161 @@
+"""
+Carrier-load matching.
+
+Pending loads are pre-filtered per carrier (capacity, schedule and, when the
+carrier's position is known, pickup radius), scored on vehicle fit, pickup
+distance, schedule and price, and the top K are kept with a heap. The
+``precompute_recommendations`` command stores every active carrier's
+recommendations in the cache so requests only have to re-check them.
+"""
+
+import heapq
+from datetime import date
+
+from django.conf import settings
+from django.core.cache import cache
+
+from logistics.market import pending_load_count
+from logistics.models import Load
+from logistics.quotes import get_quotes_batch
+from logistics.spatial import nearest_pending_loads
+
+# Relative weight of each score component; the total score is in 0..1.
+MATCH_WEIGHTS = {
+    "capacity": 0.3,
+    "proximity": 0.3,
+    "schedule": 0.2,
+    "price": 0.2,
+}
+# Loads scheduled this many days out or later get no schedule score.
+SCHEDULE_HORIZON_DAYS = 14
+# Component score used when the carrier has not entered the input.
+UNKNOWN_SCORE = 0.5
+
+
+# Carrier fields the ranking reads besides the pricing strategies' own.
+MATCHING_CARRIER_FIELDS = ("vehicle_capacity_kg", "current_latitude", "current_longitude")
+
+
+def recommendation_cache_key(carrier_pk):
+    return f"recommendations:{carrier_pk}"
+
+
+def invalidate_recommendations(carrier_pk):
+    cache.delete(recommendation_cache_key(carrier_pk))
+
+
+def candidate_loads(carrier, limit=None):
+    """
+    Pending loads a carrier could take: within their capacity, not scheduled
+    in the past and, when their position is known, with a pickup inside
+    NEARBY_LOADS_RADIUS_KM (annotated with ``pickup_distance``).
+    """
+    limit = limit or settings.RECOMMENDATION_CANDIDATES
+    capacity = carrier.vehicle_capacity_kg
+    today = date.today()
+
+    if carrier.current_latitude is not None and carrier.current_longitude is not None:
+        loads = nearest_pending_loads(
+            carrier.current_latitude,
+            carrier.current_longitude,
+            limit=limit,
+            radius_km=settings.NEARBY_LOADS_RADIUS_KM,
+        )
+        return [
+            load for load in loads
+            if (not capacity or load.weight <= capacity)
+            and (load.scheduled_date is None or load.scheduled_date >= today)
+        ]
+
+    queryset = Load.objects.pending().for_listing().exclude(scheduled_date__lt=today)
+    if capacity:
+        queryset = queryset.filter(weight__lte=capacity)
+    return list(queryset.order_by("-created_at")[:limit])
+
+
+def score_loads(loads, carrier, active_loads_count=None):
+    """
+    Return ``(score, load)`` pairs, scores between 0 and 1.
+    """
+    if not loads:
+        return []
+    if active_loads_count is None:
+        active_loads_count = pending_load_count()
+
+    capacity = float(carrier.vehicle_capacity_kg or 0)
+    radius = float(settings.NEARBY_LOADS_RADIUS_KM)
+    today = date.today()
+
+    best_prices = []
+    for prices in get_quotes_batch(loads, carrier, active_loads_count):
+        priced = [option["price"] for option in prices.values() if option.get("price") is not None]
+        best_prices.append(max(priced, default=0))
+    top_price = max(best_prices) or 1
+
+    scored = []
+    for load, best_price in zip(loads, best_prices):
+        # Fuller trucks score higher; candidates never exceed capacity.
+        capacity_score = min(float(load.weight) / capacity, 1.0) if capacity else UNKNOWN_SCORE
+
+        pickup_distance = getattr(load, "pickup_distance", None)
+        if pickup_distance is None:
+            proximity_score = UNKNOWN_SCORE
+        else:
+            proximity_score = max(0.0, 1 - pickup_distance.km / radius)
+
+        if load.scheduled_date is None:
+            schedule_score = UNKNOWN_SCORE
+        else:
+            days_until = max((load.scheduled_date - today).days, 0)
+            schedule_score = max(0.0, 1 - days_until / SCHEDULE_HORIZON_DAYS)
+
+        score = (
+            MATCH_WEIGHTS["capacity"] * capacity_score
+            + MATCH_WEIGHTS["proximity"] * proximity_score
+            + MATCH_WEIGHTS["schedule"] * schedule_score
+            + MATCH_WEIGHTS["price"] * best_price / top_price
+        )
+        scored.append((round(score, 4), load))
+    return scored
+
+
+def compute_recommendations(carrier, k=10, active_loads_count=None):
+    """
+    The ``k`` best-scoring candidate loads for a carrier as ``(score, load)``, best first.
+    """
+    scored = score_loads(candidate_loads(carrier), carrier, active_loads_count)
+    return heapq.nlargest(k, scored, key=lambda pair: pair[0])
+
+
+def store_recommendations(carrier, k=10, active_loads_count=None):
+    """
+    Rank all of a carrier's candidates, cache the ranking as ``(load pk, score)``
+    pairs and return the top ``k``. The whole ranking is cached so any later
+    ``k`` (and loads booked in the meantime) can be served from it.
+    """
+    recommendations = compute_recommendations(
+        carrier, settings.RECOMMENDATION_CANDIDATES, active_loads_count
+    )
+    cache.set(
+        recommendation_cache_key(carrier.pk),
+        [(load.pk, score) for score, load in recommendations],
+        settings.RECOMMENDATION_TTL,
+    )
+    return recommendations[:k]
+
+
+def recommended_loads(carrier, k=10):
+    """
+    A carrier's recommendations as ``(score, load)``, best first.
+
+    Served from the precomputed cache entry when there is one, skipping loads
+    that have been booked since; otherwise computed and cached now.
+    """
+    cached = cache.get(recommendation_cache_key(carrier.pk))
+    if cached is None:
+        return store_recommendations(carrier, k)
+
+    # Over-fetch so a few booked loads do not leave the list short.
+    cached = cached[:k * 2]
+    loads = Load.objects.pending().for_listing().in_bulk([pk for pk, _ in cached])
+    return [(score, loads[pk]) for pk, score in cached if pk in loads][:k]
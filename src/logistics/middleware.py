@@ -0,0 +1,20 @@
+from logistics.pricing import collect_pricing_timings
+
+
+class PricingServerTimingMiddleware:
+    """
+    Report the time each pricing strategy took during a request in a
+    ``Server-Timing`` header, visible in the browser's network panel.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with collect_pricing_timings() as timings:
+            response = self.get_response(request)
+        if timings:
+            response.headers["Server-Timing"] = ", ".join(
+                f"pricing-{key};dur={seconds * 1000:.2f}" for key, seconds in timings.items()
+            )
+        return response
@@ -0,0 +1,17 @@
+# Generated manually to store the pickup-to-destination distance on Load.
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('logistics', '0003_pricing_fields'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='load',
+            name='route_distance_km',
+            field=models.FloatField(blank=True, editable=False, help_text='Haversine distance from pickup to destination, kept in sync on save', null=True),
+        ),
+    ]
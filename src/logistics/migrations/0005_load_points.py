@@ -0,0 +1,47 @@
+# Generated manually to add GiST-indexed geography points mirroring the float coordinates.
+import django.contrib.gis.db.models.fields
+from django.contrib.gis.geos import Point
+from django.db import migrations
+
+
+def _point(latitude, longitude):
+    if latitude is None or longitude is None:
+        return None
+    return Point(longitude, latitude, srid=4326)
+
+
+def populate_points(apps, schema_editor):
+    Load = apps.get_model('logistics', 'Load')
+    batch = []
+    for load in Load.objects.only(
+        'pk', 'pickup_latitude', 'pickup_longitude', 'destination_latitude', 'destination_longitude',
+    ).iterator(chunk_size=1000):
+        load.pickup_point = _point(load.pickup_latitude, load.pickup_longitude)
+        load.destination_point = _point(load.destination_latitude, load.destination_longitude)
+        batch.append(load)
+        if len(batch) >= 1000:
+            Load.objects.bulk_update(batch, ['pickup_point', 'destination_point'])
+            batch = []
+    if batch:
+        Load.objects.bulk_update(batch, ['pickup_point', 'destination_point'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('logistics', '0004_load_route_distance_km'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='load',
+            name='pickup_point',
+            field=django.contrib.gis.db.models.fields.PointField(blank=True, editable=False, geography=True, null=True, srid=4326),
+        ),
+        migrations.AddField(
+            model_name='load',
+            name='destination_point',
+            field=django.contrib.gis.db.models.fields.PointField(blank=True, editable=False, geography=True, null=True, srid=4326),
+        ),
+        migrations.RunPython(populate_points, migrations.RunPython.noop),
+    ]
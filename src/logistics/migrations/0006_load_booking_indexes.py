@@ -0,0 +1,34 @@
+# Generated manually to add indexes for the marketplace list queries.
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('logistics', '0005_load_points'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['carrier', '-booked_at'], name='booking_carrier_booked_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='load',
+            index=models.Index(condition=models.Q(('status', 'PENDING')), fields=['-created_at', '-uuid'], name='load_pending_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='load',
+            index=models.Index(fields=['status', '-created_at'], name='load_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='load',
+            index=models.Index(fields=['consignor', '-created_at'], name='load_consignor_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='load',
+            index=models.Index(fields=['scheduled_date'], name='load_scheduled_date_idx'),
+        ),
+    ]
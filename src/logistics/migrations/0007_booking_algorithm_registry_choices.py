@@ -0,0 +1,23 @@
+# Generated manually to take Booking.selected_algorithm choices from the pricing registry.
+from django.db import migrations, models
+
+import logistics.pricing
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('logistics', '0006_load_booking_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='booking',
+            name='selected_algorithm',
+            field=models.CharField(
+                choices=logistics.pricing.pricing_choices,
+                default='dynamic',
+                max_length=20,
+            ),
+        ),
+    ]
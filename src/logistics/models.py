@@ -1,14 +1,19 @@
-from django.db import models
+from django.contrib.gis.db import models
+from django.contrib.gis.geos import Point
 from django.conf import settings
+from django.db.models import Q
 
-from logistics.utils import BookingStatus, LoadStatus
+from logistics.manager import LoadQuerySet
+from logistics.pricing import pricing_choices
+from logistics.utils import BookingStatus, LoadStatus, PricingAlgorithm, haversine_distance_km
 from user_management.models import TimeStamp, UserStamp 
 
 
-class PricingAlgorithm(models.TextChoices):
-    DYNAMIC = "dynamic", "Dynamic (market/urgency)"
-    DISTANCE = "distance", "Location (haversine)"
-    WEIGHT = "weight", "Vehicle weight fit"
+def _point(latitude, longitude):
+    if latitude is None or longitude is None:
+        return None
+    return Point(longitude, latitude, srid=4326)
+
 
 class Load(UserStamp, TimeStamp):
     """
@@ -19,6 +24,8 @@ class Load(UserStamp, TimeStamp):
         on_delete=models.CASCADE,
         related_name='loads',
         limit_choices_to={'user_type': 'consignor'},
+        # Served by load_consignor_created_idx, which leads with consignor.
+        db_index=False,
     )
     name = models.CharField(
         max_length=255, 
@@ -35,6 +42,15 @@ class Load(UserStamp, TimeStamp):
     )
     destination_latitude = models.FloatField(null=True, blank=True)
     destination_longitude = models.FloatField(null=True, blank=True)
+    route_distance_km = models.FloatField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="Haversine distance from pickup to destination, kept in sync on save",
+    )
+    # Geography mirrors of the float coordinates, GiST-indexed for proximity queries.
+    pickup_point = models.PointField(geography=True, srid=4326, null=True, blank=True, editable=False)
+    destination_point = models.PointField(geography=True, srid=4326, null=True, blank=True, editable=False)
     weight = models.DecimalField(
         max_digits=10, 
         decimal_places=2, 
@@ -47,6 +63,57 @@ class Load(UserStamp, TimeStamp):
         default=LoadStatus.PENDING
     )
 
+    objects = LoadQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Carrier listing: pending loads, newest first, keyset on (created_at, uuid).
+            models.Index(
+                fields=["-created_at", "-uuid"],
+                condition=Q(status=LoadStatus.PENDING),
+                name="load_pending_created_idx",
+            ),
+            models.Index(fields=["status", "-created_at"], name="load_status_created_idx"),
+            models.Index(fields=["consignor", "-created_at"], name="load_consignor_created_idx"),
+            models.Index(fields=["scheduled_date"], name="load_scheduled_date_idx"),
+        ]
+
+    COORDINATE_FIELDS = (
+        "pickup_latitude",
+        "pickup_longitude",
+        "destination_latitude",
+        "destination_longitude",
+    )
+
+    # Status as last read from/written to the database; None when unknown.
+    _loaded_status = None
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_status = instance.__dict__.get("status")
+        return instance
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or set(update_fields) & set(self.COORDINATE_FIELDS):
+            self.route_distance_km = haversine_distance_km(
+                self.pickup_latitude,
+                self.pickup_longitude,
+                self.destination_latitude,
+                self.destination_longitude,
+            )
+            self.pickup_point = _point(self.pickup_latitude, self.pickup_longitude)
+            self.destination_point = _point(self.destination_latitude, self.destination_longitude)
+            if update_fields is not None:
+                kwargs["update_fields"] = {
+                    *update_fields, "route_distance_km", "pickup_point", "destination_point",
+                }
+        # post_save handlers still see the previous status in _loaded_status.
+        super().save(*args, **kwargs)
+        if update_fields is None or "status" in update_fields:
+            self._loaded_status = self.status
+
     def __str__(self):
         return f"{self.name} by {self.consignor.username}"
 
@@ -62,17 +129,24 @@ class Booking(UserStamp, TimeStamp):
         on_delete=models.CASCADE,
         related_name='bookings',
         limit_choices_to={'user_type': 'carrier'},
+        # Served by booking_carrier_booked_idx, which leads with carrier.
+        db_index=False,
     )
     status = models.CharField(max_length=20, choices=BookingStatus.choices, default=BookingStatus.CONFIRMED)
     selected_algorithm = models.CharField(
         max_length=20,
-        choices=PricingAlgorithm.choices,
+        choices=pricing_choices,
         default=PricingAlgorithm.DYNAMIC,
     )
     price = models.DecimalField(max_digits=12, decimal_places=2, null=True, blank=True)
     distance_km = models.FloatField(null=True, blank=True)
     booked_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["carrier", "-booked_at"], name="booking_carrier_booked_idx"),
+        ]
+
     def __str__(self):
         suffix = f" @ {self.price}" if self.price else ""
         return f"Booking for '{self.load.name}' by {self.carrier.username}{suffix}"
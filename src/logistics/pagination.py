@@ -0,0 +1,80 @@
+import base64
+import binascii
+from datetime import datetime
+from uuid import UUID
+
+from django.db.models import Q
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+def encode_cursor(obj):
+    """
+    Encode the (created_at, uuid) position of a row into an opaque cursor.
+    """
+    raw = f"{obj.created_at.isoformat()}|{obj.pk}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    """
+    Decode a cursor produced by ``encode_cursor``.
+    Returns None when the cursor is missing or malformed.
+    """
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, pk = base64.urlsafe_b64decode(padded.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), UUID(pk)
+    except (ValueError, TypeError, binascii.Error, UnicodeDecodeError):
+        return None
+
+
+def clamp_page_size(page_size, default=DEFAULT_PAGE_SIZE):
+    """
+    Bound a requested page size to ``1..MAX_PAGE_SIZE``.
+    """
+    try:
+        page_size = int(page_size)
+    except (TypeError, ValueError):
+        return default
+    return max(1, min(page_size, MAX_PAGE_SIZE))
+
+
+def _keyset_window(queryset, cursor, page_size):
+    queryset = queryset.order_by("-created_at", "-pk")
+    position = decode_cursor(cursor)
+    if position:
+        created_at, pk = position
+        queryset = queryset.filter(
+            Q(created_at__lt=created_at) | Q(created_at=created_at, pk__lt=pk)
+        )
+    return queryset[: page_size + 1]
+
+
+def _split_page(rows, page_size):
+    next_cursor = encode_cursor(rows[page_size - 1]) if len(rows) > page_size else None
+    return rows[:page_size], next_cursor
+
+
+def keyset_paginate(queryset, cursor=None, page_size=DEFAULT_PAGE_SIZE):
+    """
+    Return ``(rows, next_cursor)`` for a queryset walked newest first.
+
+    Rows are ordered by (created_at, uuid) descending and only ``page_size + 1``
+    rows are fetched, so the cost of a page does not depend on its position.
+    """
+    page_size = clamp_page_size(page_size)
+    rows = list(_keyset_window(queryset, cursor, page_size))
+    return _split_page(rows, page_size)
+
+
+async def akeyset_paginate(queryset, cursor=None, page_size=DEFAULT_PAGE_SIZE):
+    """
+    Async version of ``keyset_paginate``.
+    """
+    page_size = clamp_page_size(page_size)
+    rows = [row async for row in _keyset_window(queryset, cursor, page_size)]
+    return _split_page(rows, page_size)
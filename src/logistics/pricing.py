@@ -0,0 +1,322 @@
+"""
+Pricing strategy registry.
+
+Each strategy prices loads for a carrier and declares the Load and carrier
+fields it reads, so querysets and cache keys can be derived from the
+registry. Register a new strategy with ``register_strategy`` (e.g. from an
+AppConfig.ready()); it then shows up in pricing_options, quotes, booking
+validation and Booking.selected_algorithm choices.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import date
+
+from django.dispatch import Signal
+
+from logistics.utils import (
+    PricingAlgorithm,
+    dynamic_pricing,
+    location_pricing,
+    weight_class_pricing,
+)
+
+try:
+    import numpy as np
+except ImportError:  # Installed with the project; without it batch pricing uses the scalar helpers.
+    np = None
+
+# Metrics hook: sent after every strategy call with ``strategy`` (key),
+# ``loads`` (number of loads priced) and ``seconds``.
+strategy_timed = Signal()
+
+
+class PricingStrategy:
+    """
+    Base class for pricing strategies.
+
+    Subclasses set ``key``, ``label``, ``load_fields`` and ``carrier_fields``
+    and implement ``quote``. Override ``quote_batch`` when many loads can be
+    priced faster together than one at a time.
+    """
+    key = None
+    label = None
+    # Load columns read by the strategy; querysets feeding pricing load these.
+    load_fields = ()
+    # Carrier attributes read by the strategy; part of every quote cache key.
+    carrier_fields = ()
+
+    def quote(self, load, carrier, active_loads_count=0):
+        """
+        Return the option dict for one load: ``price`` (None when the load
+        cannot be priced) plus any extra values to show with it.
+        """
+        raise NotImplementedError
+
+    def quote_batch(self, loads, carrier, active_loads_count=0):
+        return [self.quote(load, carrier, active_loads_count) for load in loads]
+
+
+class DynamicPricing(PricingStrategy):
+    key = PricingAlgorithm.DYNAMIC.value
+    label = "Dynamic (market + urgency)"
+    load_fields = ("weight", "scheduled_date")
+
+    def quote(self, load, carrier, active_loads_count=0):
+        return {"price": dynamic_pricing(load, carrier, active_loads_count)}
+
+    def quote_batch(self, loads, carrier, active_loads_count=0):
+        if np is None:
+            return super().quote_batch(loads, carrier, active_loads_count)
+
+        weights = np.array([float(load.weight) for load in loads])
+        today = date.today()
+        days_until = np.array(
+            [(load.scheduled_date - today).days if load.scheduled_date else 0 for load in loads]
+        )
+        # Same surge/urgency rules as dynamic_pricing().
+        surge_from_demand = 1 + min(active_loads_count / 20, 0.5)
+        urgency_factor = np.where(days_until <= 1, 1.3, np.where(days_until <= 3, 1.15, 1.0))
+        prices = (200 + weights * 5) * surge_from_demand * urgency_factor
+        return [{"price": round(price, 2)} for price in prices.tolist()]
+
+
+class DistancePricing(PricingStrategy):
+    key = PricingAlgorithm.DISTANCE.value
+    label = "Location (haversine)"
+    load_fields = (
+        "pickup_latitude",
+        "pickup_longitude",
+        "destination_latitude",
+        "destination_longitude",
+        "route_distance_km",
+        "weight",
+    )
+    carrier_fields = ("base_rate_per_km",)
+    default_rate_per_km = 90
+
+    def quote(self, load, carrier, active_loads_count=0):
+        price, distance_km = location_pricing(load, carrier, self.default_rate_per_km)
+        return {"price": price, "distance_km": distance_km}
+
+    def quote_batch(self, loads, carrier, active_loads_count=0):
+        if np is None:
+            return super().quote_batch(loads, carrier, active_loads_count)
+
+        weights = np.array([float(load.weight) for load in loads])
+        # Stored route distances, haversine only for rows without one.
+        distances = np.array(
+            [getattr(load, "route_distance_km", None) for load in loads], dtype=float
+        )
+        missing = np.flatnonzero(np.isnan(distances))
+        if missing.size:
+            coords = np.radians(np.array(
+                [
+                    (loads[i].pickup_latitude, loads[i].pickup_longitude,
+                     loads[i].destination_latitude, loads[i].destination_longitude)
+                    for i in missing
+                ],
+                dtype=float,
+            ))
+            rlat1, rlon1, rlat2, rlon2 = coords.T
+            a = (
+                np.sin((rlat2 - rlat1) / 2) ** 2
+                + np.cos(rlat1) * np.cos(rlat2) * np.sin((rlon2 - rlon1) / 2) ** 2
+            )
+            raw_distances = 6371 * 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+            # Round with round() so results match haversine_distance_km() exactly.
+            distances[missing] = [round(d, 2) for d in raw_distances.tolist()]
+
+        rate = float(getattr(carrier, "base_rate_per_km", None) or self.default_rate_per_km)
+        prices = distances * rate + weights * 3
+
+        options = []
+        for price, distance_km in zip(prices.tolist(), distances.tolist()):
+            if distance_km != distance_km:  # NaN: a coordinate was missing
+                options.append({"price": None, "distance_km": None})
+            else:
+                options.append({"price": round(price, 2), "distance_km": distance_km})
+        return options
+
+
+class WeightClassPricing(PricingStrategy):
+    key = PricingAlgorithm.WEIGHT.value
+    label = "Vehicle Weight Fit"
+    load_fields = ("weight",)
+    carrier_fields = ("vehicle_capacity_kg",)
+
+    def quote(self, load, carrier, active_loads_count=0):
+        return {
+            "price": weight_class_pricing(load, carrier),
+            "capacity": getattr(carrier, "vehicle_capacity_kg", None),
+        }
+
+    def quote_batch(self, loads, carrier, active_loads_count=0):
+        if np is None:
+            return super().quote_batch(loads, carrier, active_loads_count)
+
+        weights = np.array([float(load.weight) for load in loads])
+        # Capacity is per carrier, so only the comparison is vectorized.
+        capacity = float(getattr(carrier, "vehicle_capacity_kg", 0) or 0)
+        if capacity <= 0:
+            multiplier = 1.25
+        else:
+            multiplier = np.where(weights <= capacity, 0.9, 1.4)
+        prices = (150 + weights * 6) * multiplier
+        carrier_capacity = getattr(carrier, "vehicle_capacity_kg", None)
+        return [
+            {"price": round(price, 2), "capacity": carrier_capacity}
+            for price in prices.tolist()
+        ]
+
+
+# --- Registry ------------------------------------------------------------------
+
+_strategies = {}
+
+
+def register_strategy(strategy):
+    """
+    Add a PricingStrategy instance (or class) to the registry, replacing any
+    strategy with the same key. Options are offered in registration order.
+    """
+    if isinstance(strategy, type):
+        strategy = strategy()
+    if not strategy.key or len(strategy.key) > 20:
+        raise ValueError("Pricing strategy keys must be 1-20 characters.")
+    _strategies[strategy.key] = strategy
+    return strategy
+
+
+def get_strategy(key):
+    """
+    The registered strategy for ``key``, or None.
+    """
+    return _strategies.get(key)
+
+
+def get_strategies():
+    return list(_strategies.values())
+
+
+def pricing_choices():
+    """
+    Choices for Booking.selected_algorithm.
+    """
+    return [(strategy.key, strategy.label) for strategy in _strategies.values()]
+
+
+def pricing_load_fields():
+    """
+    Load columns any registered strategy reads.
+    """
+    fields = {}
+    for strategy in _strategies.values():
+        fields.update(dict.fromkeys(strategy.load_fields))
+    return tuple(fields)
+
+
+def pricing_carrier_fields():
+    """
+    Carrier attributes any registered strategy reads.
+    """
+    fields = {}
+    for strategy in _strategies.values():
+        fields.update(dict.fromkeys(strategy.carrier_fields))
+    return tuple(fields)
+
+
+def pricing_carrier_key(carrier):
+    """
+    The registered strategies and the carrier inputs they read, for cache keys.
+    """
+    return (
+        ",".join(_strategies),
+        *(str(getattr(carrier, field, None)) for field in pricing_carrier_fields()),
+    )
+
+
+for _strategy in (DynamicPricing, DistancePricing, WeightClassPricing):
+    register_strategy(_strategy)
+
+
+# --- Instrumentation -----------------------------------------------------------
+
+_stats = {}
+_stats_lock = threading.Lock()
+_request_timings = ContextVar("pricing_request_timings", default=None)
+
+
+def pricing_stats():
+    """
+    Process-wide ``{key: {"calls", "loads", "seconds"}}`` per strategy.
+    """
+    with _stats_lock:
+        return {key: dict(stats) for key, stats in _stats.items()}
+
+
+def reset_pricing_stats():
+    with _stats_lock:
+        _stats.clear()
+
+
+@contextmanager
+def collect_pricing_timings():
+    """
+    Collect ``{key: seconds}`` for strategy calls made inside the block,
+    e.g. to report one request's pricing cost.
+    """
+    timings = {}
+    token = _request_timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _request_timings.reset(token)
+
+
+def _record(strategy, loads_count, seconds):
+    with _stats_lock:
+        stats = _stats.setdefault(strategy.key, {"calls": 0, "loads": 0, "seconds": 0.0})
+        stats["calls"] += 1
+        stats["loads"] += loads_count
+        stats["seconds"] += seconds
+    timings = _request_timings.get()
+    if timings is not None:
+        timings[strategy.key] = timings.get(strategy.key, 0.0) + seconds
+    strategy_timed.send(
+        sender=type(strategy), strategy=strategy.key, loads=loads_count, seconds=seconds,
+    )
+
+
+def _timed_batch(strategy, loads, carrier, active_loads_count):
+    started = time.perf_counter()
+    options = strategy.quote_batch(loads, carrier, active_loads_count)
+    _record(strategy, len(loads), time.perf_counter() - started)
+    return options
+
+
+# --- Entry points --------------------------------------------------------------
+
+def pricing_options(load, carrier, active_loads_count=0):
+    """
+    Return a dictionary of pricing strategies for easy rendering.
+    """
+    return pricing_options_batch([load], carrier, active_loads_count)[0]
+
+
+def pricing_options_batch(loads, carrier, active_loads_count=0):
+    """
+    Price many loads for one carrier with every registered strategy.
+    Returns one ``{key: {"label", "price", ...}}`` dict per load, in input order.
+    """
+    loads = list(loads)
+    results = [{} for _ in loads]
+    if not loads:
+        return results
+    for strategy in get_strategies():
+        options = _timed_batch(strategy, loads, carrier, active_loads_count)
+        for result, option in zip(results, options):
+            result[strategy.key] = {"label": strategy.label, **option}
+    return results
@@ -0,0 +1,113 @@
+from datetime import date
+from decimal import Decimal
+
+from django.conf import settings
+from django.core import signing
+from django.core.cache import caches
+
+from logistics.pricing import pricing_carrier_key, pricing_options_batch
+from logistics.utils import surge_bucket
+
+QUOTE_CACHE_ALIAS = "quotes"
+QUOTE_TOKEN_SALT = "logistics.quote"
+
+
+def quote_cache_key(load, carrier, active_loads_count):
+    """
+    Key covering every input of pricing_options.
+
+    The load's updated_at, the registered strategies and the carrier fields
+    they read are part of the key, so changing any of them invalidates old
+    quotes; stale entries age out via the cache's TTL and LRU culling.
+    """
+    return ":".join([
+        "quote",
+        str(load.pk),
+        str(load.updated_at.timestamp()),
+        str(carrier.pk),
+        *pricing_carrier_key(carrier),
+        str(surge_bucket(active_loads_count)),
+        date.today().isoformat(),
+    ])
+
+
+def get_quotes_batch(loads, carrier, active_loads_count):
+    """
+    ``pricing_options`` for each load, served from the quote cache and
+    computing only the misses in one batch.
+    """
+    loads = list(loads)
+    cache = caches[QUOTE_CACHE_ALIAS]
+    keys = [quote_cache_key(load, carrier, active_loads_count) for load in loads]
+    cached = cache.get_many(keys)
+
+    missing = [(key, load) for key, load in zip(keys, loads) if key not in cached]
+    if missing:
+        prices = pricing_options_batch([load for _, load in missing], carrier, active_loads_count)
+        fresh = {key: load_prices for (key, _), load_prices in zip(missing, prices)}
+        cache.set_many(fresh)
+        cached.update(fresh)
+
+    return [cached[key] for key in keys]
+
+
+def get_quotes(load, carrier, active_loads_count):
+    """
+    ``pricing_options`` for one load, served from the quote cache.
+    """
+    return get_quotes_batch([load], carrier, active_loads_count)[0]
+
+
+class InvalidQuote(Exception):
+    """
+    Raised when a quote token was tampered with or issued for another booking.
+    """
+
+
+def sign_quotes(load, carrier, prices):
+    """
+    Copy of a pricing_options dict with a signed ``token`` on every priced option.
+    The token binds load, carrier, algorithm, price and distance.
+    """
+    signed = {}
+    for algorithm, option in prices.items():
+        option = dict(option)
+        if option.get("price") is not None:
+            option["token"] = signing.dumps(
+                {
+                    "load": str(load.pk),
+                    "version": load.updated_at.timestamp(),
+                    "carrier": str(carrier.pk),
+                    "algorithm": algorithm,
+                    "price": str(option["price"]),
+                    "distance_km": option.get("distance_km"),
+                },
+                salt=QUOTE_TOKEN_SALT,
+                compress=True,
+            )
+        signed[algorithm] = option
+    return signed
+
+
+def verify_quote(token, load, carrier, algorithm):
+    """
+    Return ``{"price", "distance_km"}`` from a valid quote token.
+
+    Returns None when the token has expired or the load changed since it was
+    issued, so the caller can price afresh. Raises InvalidQuote when the token
+    is forged or belongs to another load, carrier or algorithm.
+    """
+    try:
+        quote = signing.loads(token, salt=QUOTE_TOKEN_SALT, max_age=settings.QUOTE_TOKEN_TTL_SECONDS)
+    except signing.SignatureExpired:
+        return None
+    except signing.BadSignature:
+        raise InvalidQuote("This price quote is not valid.")
+
+    if (quote.get("load"), quote.get("carrier"), quote.get("algorithm")) != (
+        str(load.pk), str(carrier.pk), algorithm,
+    ):
+        raise InvalidQuote("This price quote was issued for a different booking.")
+    if quote.get("version") != load.updated_at.timestamp():
+        return None
+    return {"price": Decimal(quote["price"]), "distance_km": quote.get("distance_km")}
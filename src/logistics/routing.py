@@ -0,0 +1,248 @@
+"""
+Road-network distances from a precomputed route table.
+
+``build_route_table`` (run offline through the ``build_route_table``
+management command) runs Dijkstra from every node of a road graph and writes
+the all-pairs distance matrix to a binary file. At runtime the file is
+memory-mapped, load coordinates are snapped to their nearest graph nodes and
+a road distance is one matrix read.
+
+File layout (little-endian)::
+
+    8s   magic  b"GANTRT1\\0"
+    I    node count N
+    4x   padding
+    N*2d node latitude, longitude
+    N*N f road distance in km from row node to column node (inf: unreachable)
+"""
+
+import heapq
+import json
+import logging
+import mmap
+import os
+import struct
+import sys
+import threading
+from array import array
+from collections import defaultdict
+
+from django.conf import settings
+
+from logistics.pricing import DistancePricing, PricingStrategy
+from logistics.spatial import GridIndex
+from logistics.utils import haversine_distance_km
+
+MAGIC = b"GANTRT1\0"
+HEADER = struct.Struct("<8sI4x")
+COORDINATE = struct.Struct("<dd")
+DISTANCE = struct.Struct("<f")
+
+logger = logging.getLogger(__name__)
+
+
+class RouteTableError(Exception):
+    """
+    Raised when a graph or route table file cannot be read.
+    """
+
+
+def load_graph(path):
+    """
+    Read a road graph from a JSON file::
+
+        {"nodes": [{"id": "ktm", "lat": 27.7, "lon": 85.3}, ...],
+         "edges": [{"from": "ktm", "to": "pkr", "km": 200.1, "oneway": false}, ...]}
+
+    Edges without ``km`` use the straight-line distance between their nodes.
+    Returns ``(nodes, adjacency)``: a list of ``(id, lat, lon)`` and, per node
+    index, a list of ``(neighbour index, km)``.
+    """
+    try:
+        with open(path) as f:
+            graph = json.load(f)
+        nodes = [(node["id"], float(node["lat"]), float(node["lon"])) for node in graph["nodes"]]
+        index = {node_id: i for i, (node_id, _, _) in enumerate(nodes)}
+        adjacency = defaultdict(list)
+        for edge in graph["edges"]:
+            a, b = index[edge["from"]], index[edge["to"]]
+            km = edge.get("km")
+            if km is None:
+                km = haversine_distance_km(nodes[a][1], nodes[a][2], nodes[b][1], nodes[b][2])
+            adjacency[a].append((b, float(km)))
+            if not edge.get("oneway", False):
+                adjacency[b].append((a, float(km)))
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        raise RouteTableError(f"Cannot read road graph {path}: {e}")
+    return nodes, adjacency
+
+
+def _shortest_paths(source, adjacency, node_count):
+    distances = [float("inf")] * node_count
+    distances[source] = 0.0
+    heap = [(0.0, source)]
+    while heap:
+        distance, node = heapq.heappop(heap)
+        if distance > distances[node]:
+            continue
+        for neighbour, km in adjacency.get(node, ()):
+            candidate = distance + km
+            if candidate < distances[neighbour]:
+                distances[neighbour] = candidate
+                heapq.heappush(heap, (candidate, neighbour))
+    return distances
+
+
+def build_route_table(nodes, adjacency, path):
+    """
+    Write the all-pairs road distance table for a graph from ``load_graph``.
+    The file is written next to ``path`` and swapped in atomically, so
+    processes with the old table mapped keep reading a consistent copy.
+    """
+    node_count = len(nodes)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, node_count))
+        for _, latitude, longitude in nodes:
+            f.write(COORDINATE.pack(latitude, longitude))
+        for source in range(node_count):
+            row = array("f", _shortest_paths(source, adjacency, node_count))
+            if sys.byteorder == "big":
+                row.byteswap()
+            row.tofile(f)
+    os.replace(tmp_path, path)
+
+
+class RouteTable:
+    """
+    Read-only, memory-mapped route table with nearest-node snapping.
+    """
+
+    def __init__(self, path, snap_cell_deg=0.25):
+        self.path = path
+        try:
+            with open(path, "rb") as f:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as e:
+            raise RouteTableError(f"Cannot open route table {path}: {e}")
+
+        if len(self._map) < HEADER.size:
+            self._map.close()
+            raise RouteTableError(f"{path} is not a valid route table.")
+        magic, self.node_count = HEADER.unpack_from(self._map, 0)
+        self._matrix_offset = HEADER.size + self.node_count * COORDINATE.size
+        expected_size = self._matrix_offset + self.node_count ** 2 * DISTANCE.size
+        if magic != MAGIC or len(self._map) != expected_size:
+            self._map.close()
+            raise RouteTableError(f"{path} is not a valid route table.")
+
+        self._nodes = GridIndex(snap_cell_deg)
+        for node in range(self.node_count):
+            latitude, longitude = COORDINATE.unpack_from(self._map, HEADER.size + node * COORDINATE.size)
+            self._nodes.insert(node, latitude, longitude)
+
+    def close(self):
+        self._map.close()
+
+    def snap(self, latitude, longitude, max_km=None):
+        """
+        Return ``(distance_km, node)`` for the nearest graph node, or None.
+        """
+        nearest = self._nodes.nearest(latitude, longitude, k=1, max_km=max_km)
+        return nearest[0] if nearest else None
+
+    def node_distance_km(self, source, target):
+        """
+        Road distance between two nodes; None when no route exists.
+        """
+        offset = self._matrix_offset + (source * self.node_count + target) * DISTANCE.size
+        (distance,) = DISTANCE.unpack_from(self._map, offset)
+        return None if distance == float("inf") else distance
+
+    def road_distance_km(self, lat1, lon1, lat2, lon2, max_snap_km=None):
+        """
+        Road distance between two coordinates, including the straight-line
+        legs to and from the snapped nodes. None when a coordinate is missing,
+        too far from the network or the nodes are not connected.
+        """
+        if None in (lat1, lon1, lat2, lon2):
+            return None
+        origin = self.snap(lat1, lon1, max_snap_km)
+        destination = self.snap(lat2, lon2, max_snap_km)
+        if origin is None or destination is None:
+            return None
+        distance = self.node_distance_km(origin[1], destination[1])
+        if distance is None:
+            return None
+        return round(origin[0] + distance + destination[0], 2)
+
+
+_route_table = None
+_route_table_mtime = None
+_route_table_lock = threading.Lock()
+
+
+def get_route_table():
+    """
+    The process-wide RouteTable for ROUTE_TABLE_PATH, or None when no table
+    has been built or the file cannot be read. Remapped when the file is
+    rebuilt; a bad file is logged once per change rather than on every call.
+    """
+    global _route_table, _route_table_mtime
+    path = settings.ROUTE_TABLE_PATH
+    try:
+        mtime = os.stat(path).st_mtime_ns if path else None
+    except OSError:
+        mtime = None
+    with _route_table_lock:
+        if mtime != _route_table_mtime:
+            # The old map is left to the garbage collector; a request may still be reading it.
+            _route_table = None
+            if mtime:
+                try:
+                    _route_table = RouteTable(path, settings.PICKUP_INDEX_CELL_DEG)
+                except RouteTableError as e:
+                    logger.error("Road pricing disabled until the route table is rebuilt: %s", e)
+            _route_table_mtime = mtime
+        return _route_table
+
+
+class RoadPricing(PricingStrategy):
+    """
+    DistancePricing's formula over road distance from the route table.
+    """
+    key = "road"
+    label = "Road distance"
+    load_fields = (
+        "pickup_latitude",
+        "pickup_longitude",
+        "destination_latitude",
+        "destination_longitude",
+        "weight",
+    )
+    carrier_fields = ("base_rate_per_km",)
+
+    def quote(self, load, carrier, active_loads_count=0):
+        return self.quote_batch([load], carrier, active_loads_count)[0]
+
+    def quote_batch(self, loads, carrier, active_loads_count=0):
+        table = get_route_table()
+        if table is None:
+            return [{"price": None, "distance_km": None} for _ in loads]
+
+        rate = float(getattr(carrier, "base_rate_per_km", None) or DistancePricing.default_rate_per_km)
+        options = []
+        for load in loads:
+            distance_km = table.road_distance_km(
+                load.pickup_latitude,
+                load.pickup_longitude,
+                load.destination_latitude,
+                load.destination_longitude,
+                max_snap_km=settings.ROUTE_SNAP_MAX_KM,
+            )
+            if distance_km is None:
+                options.append({"price": None, "distance_km": None})
+            else:
+                price = distance_km * rate + float(load.weight) * 3
+                options.append({"price": round(price, 2), "distance_km": distance_km})
+        return options
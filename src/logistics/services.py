@@ -0,0 +1,194 @@
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from logistics.events import LOAD_BOOKED, publish_load_event
+from logistics.market import adjust_pending_load_count, pending_load_count
+from logistics.models import Booking, Load
+from logistics.pricing import get_strategy
+from logistics.spatial import remove_pending_pickup
+from logistics.quotes import InvalidQuote, get_quotes, get_quotes_batch, verify_quote
+from logistics.utils import LoadStatus
+
+MAX_BULK_BOOKINGS = 100
+
+
+class BookingError(Exception):
+    """
+    Raised when a load cannot be booked; the message is safe to show to the carrier.
+    """
+
+
+def _mark_booked(loads, booked_at):
+    """
+    Sync instances with a QuerySet.update() that booked them and, since that
+    update skips the Load signals, schedule their side effects on commit.
+    """
+    for load in loads:
+        load.status = LoadStatus.BOOKED
+        load._loaded_status = LoadStatus.BOOKED
+        load.updated_at = booked_at
+    transaction.on_commit(lambda: adjust_pending_load_count(-len(loads)))
+    for load in loads:
+        transaction.on_commit(lambda load=load: remove_pending_pickup(load.pk))
+        transaction.on_commit(lambda load=load: publish_load_event(LOAD_BOOKED, load))
+
+
+def book_load(load, carrier, algorithm, quote_token=None):
+    """
+    Book a pending load for a carrier and return the new Booking.
+
+    A valid signed ``quote_token`` fixes the price the carrier was shown;
+    without one (or once it has expired) the load is priced afresh.
+    The load is claimed with a conditional ``UPDATE ... WHERE status='PENDING'``,
+    so concurrent carriers are settled by the database in one round trip and
+    only the winner inserts a Booking. Losers get a BookingError.
+    """
+    if get_strategy(algorithm) is None:
+        raise BookingError("Unknown pricing algorithm.")
+
+    price_data = None
+    if quote_token:
+        try:
+            price_data = verify_quote(quote_token, load, carrier, algorithm)
+        except InvalidQuote as e:
+            raise BookingError(str(e))
+    if price_data is None:
+        price_data = get_quotes(load, carrier, pending_load_count()).get(algorithm)
+    if not price_data or price_data.get("price") is None:
+        raise BookingError("Unable to calculate price for the selected algorithm.")
+
+    try:
+        with transaction.atomic():
+            now = timezone.now()
+            claimed = Load.objects.filter(pk=load.pk, status=LoadStatus.PENDING).update(
+                status=LoadStatus.BOOKED,
+                updated_at=now,
+            )
+            if not claimed:
+                raise BookingError("This load is no longer available.")
+
+            booking = Booking.objects.create(
+                load=load,
+                carrier=carrier,
+                selected_algorithm=algorithm,
+                price=price_data.get("price"),
+                distance_km=price_data.get("distance_km"),
+            )
+            _mark_booked([load], now)
+    except IntegrityError:
+        raise BookingError("This load has already been booked.")
+
+    return booking
+
+
+def book_loads_bulk(carrier, selections):
+    """
+    Book several loads for one carrier in a single transaction.
+
+    ``selections`` maps load pk to the chosen pricing strategy key. Pending
+    loads are locked with one ``SELECT ... FOR UPDATE SKIP LOCKED``, priced
+    against a single market-count snapshot, inserted with ``bulk_create`` and
+    flipped to BOOKED with one ``UPDATE``. Returns a per-load report dict.
+    """
+    if len(selections) > MAX_BULK_BOOKINGS:
+        raise BookingError(f"At most {MAX_BULK_BOOKINGS} loads can be booked at once.")
+
+    report = {}
+    wanted = {}
+    for pk, algorithm in selections.items():
+        if get_strategy(algorithm) is None:
+            report[pk] = {"booked": False, "error": "Unknown pricing algorithm."}
+        else:
+            wanted[pk] = algorithm
+
+    with transaction.atomic():
+        loads = list(
+            Load.objects.pending()
+            .for_pricing()
+            .filter(pk__in=wanted)
+            .select_for_update(skip_locked=True)
+        )
+        prices = get_quotes_batch(loads, carrier, pending_load_count())
+
+        bookings = []
+        for load, load_prices in zip(loads, prices):
+            algorithm = wanted[load.pk]
+            price_data = load_prices.get(algorithm) or {}
+            if price_data.get("price") is None:
+                report[load.pk] = {
+                    "booked": False,
+                    "error": "Unable to calculate price for the selected algorithm.",
+                }
+                continue
+            bookings.append(Booking(
+                load=load,
+                carrier=carrier,
+                selected_algorithm=algorithm,
+                price=price_data.get("price"),
+                distance_km=price_data.get("distance_km"),
+            ))
+
+        if bookings:
+            now = timezone.now()
+            Load.objects.filter(pk__in=[booking.load_id for booking in bookings]).update(
+                status=LoadStatus.BOOKED,
+                updated_at=now,
+            )
+            Booking.objects.bulk_create(bookings)
+            _mark_booked([booking.load for booking in bookings], now)
+
+    for booking in bookings:
+        report[booking.load_id] = {
+            "booked": True,
+            "algorithm": booking.selected_algorithm,
+            "price": booking.price,
+            "distance_km": booking.distance_km,
+        }
+    for pk in wanted:
+        report.setdefault(pk, {"booked": False, "error": "This load is no longer available."})
+    return report
+
+
+def book_assignments(assignments, algorithm):
+    """
+    Book dispatch assignments (``(carrier, load, ...)`` tuples) in one
+    transaction, pricing each with ``algorithm``.
+
+    Loads that were booked or locked elsewhere since the assignment was
+    computed are skipped. Returns the created bookings.
+    """
+    if get_strategy(algorithm) is None:
+        raise BookingError("Unknown pricing algorithm.")
+
+    carriers = {assignment.load.pk: assignment.carrier for assignment in assignments}
+    active_count = pending_load_count()
+    with transaction.atomic():
+        loads = (
+            Load.objects.pending()
+            .for_pricing()
+            .filter(pk__in=carriers)
+            .select_for_update(skip_locked=True)
+        )
+        bookings = []
+        for load in loads:
+            carrier = carriers[load.pk]
+            price_data = get_quotes(load, carrier, active_count).get(algorithm) or {}
+            if price_data.get("price") is None:
+                continue
+            bookings.append(Booking(
+                load=load,
+                carrier=carrier,
+                selected_algorithm=algorithm,
+                price=price_data.get("price"),
+                distance_km=price_data.get("distance_km"),
+            ))
+
+        if bookings:
+            now = timezone.now()
+            Load.objects.filter(pk__in=[booking.load_id for booking in bookings]).update(
+                status=LoadStatus.BOOKED,
+                updated_at=now,
+            )
+            Booking.objects.bulk_create(bookings)
+            _mark_booked([booking.load for booking in bookings], now)
+    return bookings
@@ -0,0 +1,78 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from logistics.events import LOAD_BOOKED, LOAD_CANCELLED, LOAD_CREATED, publish_load_event
+from logistics.market import adjust_pending_load_count, reset_pending_load_count
+from logistics.matching import MATCHING_CARRIER_FIELDS, invalidate_recommendations
+from logistics.models import Load
+from logistics.pricing import pricing_carrier_fields
+from logistics.spatial import remove_pending_pickup, update_pending_pickup
+from logistics.utils import LoadStatus
+
+
+@receiver(post_save, sender=Load)
+def track_pending_count_on_save(sender, instance, created, update_fields=None, **kwargs):
+    if update_fields is not None and "status" not in update_fields:
+        return
+
+    is_pending = instance.status == LoadStatus.PENDING
+    if created:
+        was_pending = False
+    elif instance._loaded_status is None:
+        # Status was never loaded (deferred or unsaved copy): recount lazily.
+        transaction.on_commit(reset_pending_load_count)
+        return
+    else:
+        was_pending = instance._loaded_status == LoadStatus.PENDING
+
+    delta = int(is_pending) - int(was_pending)
+    if delta:
+        transaction.on_commit(lambda: adjust_pending_load_count(delta))
+
+
+@receiver(post_delete, sender=Load)
+def track_pending_count_on_delete(sender, instance, **kwargs):
+    if instance.status == LoadStatus.PENDING:
+        transaction.on_commit(lambda: adjust_pending_load_count(-1))
+
+
+@receiver(post_save, sender=Load)
+def track_pickup_index_on_save(sender, instance, **kwargs):
+    transaction.on_commit(lambda: update_pending_pickup(instance))
+
+
+@receiver(post_delete, sender=Load)
+def track_pickup_index_on_delete(sender, instance, **kwargs):
+    pk = instance.pk
+    transaction.on_commit(lambda: remove_pending_pickup(pk))
+
+
+@receiver(post_save, sender=Load)
+def publish_load_events_on_save(sender, instance, created, update_fields=None, **kwargs):
+    if created:
+        event_type = LOAD_CREATED
+    elif update_fields is not None and "status" not in update_fields:
+        return
+    elif instance.status == instance._loaded_status:
+        return
+    elif instance.status == LoadStatus.BOOKED:
+        event_type = LOAD_BOOKED
+    elif instance.status == LoadStatus.CANCELLED:
+        event_type = LOAD_CANCELLED
+    else:
+        return
+    transaction.on_commit(lambda: publish_load_event(event_type, instance))
+
+
+@receiver(post_save, sender=get_user_model())
+def invalidate_recommendations_on_save(sender, instance, update_fields=None, **kwargs):
+    # A cached ranking is only valid for the capacity, position and rates it was built from.
+    inputs = {*MATCHING_CARRIER_FIELDS, *pricing_carrier_fields()}
+    if update_fields is not None and inputs.isdisjoint(update_fields):
+        return
+    pk = instance.pk
+    invalidate_recommendations(pk)
+    # Drop it again after commit in case a request re-cached the old ranking meanwhile.
+    transaction.on_commit(lambda: invalidate_recommendations(pk))
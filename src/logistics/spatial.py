@@ -0,0 +1,236 @@
+import copy
+import heapq
+import threading
+import time
+from collections import defaultdict
+from math import cos, floor, radians
+
+from django.conf import settings
+from django.contrib.gis.measure import D
+from django.db import connection
+from django.db.models import Value
+
+from logistics.utils import LoadStatus, haversine_distance_km
+
+KM_PER_DEGREE = 111.195
+
+
+class GridIndex:
+    """
+    Uniform lat/lon grid of points for nearest-neighbour lookups without PostGIS.
+    Cells are scanned in rings around the query point, so only nearby buckets
+    are passed to haversine_distance_km.
+    """
+
+    def __init__(self, cell_size_deg=0.25):
+        self.cell_size = cell_size_deg
+        self._cells = defaultdict(dict)
+        self._positions = {}
+
+    def __len__(self):
+        return len(self._positions)
+
+    def __contains__(self, key):
+        return key in self._positions
+
+    def _cell(self, latitude, longitude):
+        return floor(latitude / self.cell_size), floor(longitude / self.cell_size)
+
+    def insert(self, key, latitude, longitude):
+        self.remove(key)
+        self._positions[key] = (latitude, longitude)
+        self._cells[self._cell(latitude, longitude)][key] = (latitude, longitude)
+
+    def remove(self, key):
+        position = self._positions.pop(key, None)
+        if position is None:
+            return
+        cell = self._cell(*position)
+        bucket = self._cells[cell]
+        bucket.pop(key, None)
+        if not bucket:
+            del self._cells[cell]
+
+    def _ring(self, row, col, radius):
+        if radius == 0:
+            yield row, col
+            return
+        for c in range(col - radius, col + radius + 1):
+            yield row - radius, c
+            yield row + radius, c
+        for r in range(row - radius + 1, row + radius):
+            yield r, col - radius
+            yield r, col + radius
+
+    def _ring_min_km(self, latitude, radius):
+        """
+        Lower bound on the distance from the query point to any cell of a ring.
+        """
+        if radius <= 1:
+            return 0.0
+        steps = (radius - 1) * self.cell_size
+        # A degree of longitude is shortest at the ring's most polar latitude.
+        polar_lat = min(abs(latitude) + radius * self.cell_size, 89.0)
+        return steps * KM_PER_DEGREE * cos(radians(polar_lat))
+
+    def nearest(self, latitude, longitude, k=10, max_km=None):
+        """
+        Return up to ``k`` ``(distance_km, key)`` pairs, nearest first.
+        """
+        if k <= 0 or not self._positions:
+            return []
+
+        row, col = self._cell(latitude, longitude)
+        best = []  # max-heap of (-distance, key) holding the k nearest so far
+        seen = 0
+        radius = 0
+        while seen < len(self._positions):
+            bound = self._ring_min_km(latitude, radius)
+            if max_km is not None and bound > max_km:
+                break
+            if len(best) == k and bound > -best[0][0]:
+                break
+            for cell in self._ring(row, col, radius):
+                for key, (lat, lon) in self._cells.get(cell, {}).items():
+                    seen += 1
+                    distance = haversine_distance_km(latitude, longitude, lat, lon)
+                    if max_km is not None and distance > max_km:
+                        continue
+                    if len(best) < k:
+                        heapq.heappush(best, (-distance, key))
+                    elif distance < -best[0][0]:
+                        heapq.heapreplace(best, (-distance, key))
+            radius += 1
+
+        return sorted((-negative, key) for negative, key in best)
+
+
+_pickup_index = None
+_pickup_index_built_at = 0.0
+_pickup_index_lock = threading.Lock()
+
+
+def pending_pickup_index():
+    """
+    Process-wide GridIndex of pending load pickups keyed by load pk.
+    Built lazily, kept current by signals and rebuilt every PICKUP_INDEX_TTL
+    seconds to pick up changes made by other processes.
+    """
+    global _pickup_index, _pickup_index_built_at
+    with _pickup_index_lock:
+        expired = time.monotonic() - _pickup_index_built_at > settings.PICKUP_INDEX_TTL
+        if _pickup_index is None or expired:
+            from logistics.models import Load
+
+            index = GridIndex(settings.PICKUP_INDEX_CELL_DEG)
+            rows = (
+                Load.objects.pending()
+                .filter(pickup_latitude__isnull=False, pickup_longitude__isnull=False)
+                .values_list("pk", "pickup_latitude", "pickup_longitude")
+            )
+            for pk, latitude, longitude in rows.iterator(chunk_size=2000):
+                index.insert(pk, latitude, longitude)
+            _pickup_index = index
+            _pickup_index_built_at = time.monotonic()
+        return _pickup_index
+
+
+def update_pending_pickup(load):
+    """
+    Reflect a saved load in the pickup index, if the index has been built.
+    """
+    with _pickup_index_lock:
+        if _pickup_index is None:
+            return
+        if (
+            load.status == LoadStatus.PENDING
+            and load.pickup_latitude is not None
+            and load.pickup_longitude is not None
+        ):
+            _pickup_index.insert(load.pk, load.pickup_latitude, load.pickup_longitude)
+        else:
+            _pickup_index.remove(load.pk)
+
+
+def remove_pending_pickup(pk):
+    with _pickup_index_lock:
+        if _pickup_index is not None:
+            _pickup_index.remove(pk)
+
+
+def nearest_pending_pickups(latitude, longitude, limit, radius_km=None):
+    """
+    ``(distance_km, pk)`` pairs from the in-process pickup index, nearest first.
+    """
+    index = pending_pickup_index()
+    with _pickup_index_lock:
+        return index.nearest(latitude, longitude, k=limit, max_km=radius_km)
+
+
+def nearest_pending_loads(latitude, longitude, limit, radius_km=None):
+    """
+    Pending loads ordered by pickup distance, each annotated with ``pickup_distance``.
+    Runs an indexed PostGIS query when available, otherwise uses the in-process grid.
+    """
+    from logistics.models import Load
+
+    if getattr(connection.ops, "postgis", False):
+        queryset = Load.objects.pending().for_listing()
+        return list(queryset.nearest_pickups(latitude, longitude, radius_km)[:limit])
+
+    matches = nearest_pending_pickups(latitude, longitude, limit, radius_km)
+    loads = Load.objects.pending().for_listing().in_bulk([pk for _, pk in matches])
+    result = []
+    for distance_km, pk in matches:
+        load = loads.get(pk)
+        if load is not None:
+            load.pickup_distance = D(km=distance_km)
+            result.append(load)
+    return result
+
+
+def nearest_pending_loads_for_each(origins, limit, radius_km=None):
+    """
+    ``{key: [load, ...]}`` for a dict of ``{key: (latitude, longitude)}``
+    origins: up to ``limit`` pending loads per origin, nearest first, each
+    annotated with ``pickup_distance``. A single query either way: a UNION of
+    per-origin PostGIS KNN queries, or one in_bulk() for the grid's matches.
+    """
+    from logistics.models import Load
+
+    if not origins:
+        return {}
+
+    if getattr(connection.ops, "postgis", False):
+        queryset = Load.objects.pending().for_listing()
+        per_origin = [
+            queryset.nearest_pickups(latitude, longitude, radius_km)
+            .annotate(origin_key=Value(key))[:limit]
+            for key, (latitude, longitude) in origins.items()
+        ]
+        result = {key: [] for key in origins}
+        # The UNION drops the per-origin ordering.
+        for load in per_origin[0].union(*per_origin[1:], all=True):
+            result[load.origin_key].append(load)
+        for loads in result.values():
+            loads.sort(key=lambda load: load.pickup_distance)
+        return result
+
+    matches = {
+        key: nearest_pending_pickups(latitude, longitude, limit, radius_km)
+        for key, (latitude, longitude) in origins.items()
+    }
+    loads = Load.objects.pending().for_listing().in_bulk(
+        {pk for pairs in matches.values() for _, pk in pairs}
+    )
+    result = {}
+    for key, pairs in matches.items():
+        result[key] = []
+        for distance_km, pk in pairs:
+            load = loads.get(pk)
+            if load is not None:
+                # Each origin gets its own instance to carry its distance.
+                load = copy.copy(load)
+                load.pickup_distance = D(km=distance_km)
+                result[key].append(load)
+    return result
@@ -1,3 +1,299 @@
-from django.test import TestCase
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from decimal import Decimal
+from unittest import skipUnless
 
-# Create your tests here.
+from django.contrib.gis.geos import Point
+from django.core.cache import caches
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from django.urls import reverse
+
+from logistics import spatial
+from logistics.models import Booking, Load
+from logistics.pagination import DEFAULT_PAGE_SIZE
+from logistics.services import BookingError, book_load
+from logistics.utils import LoadStatus, PricingAlgorithm
+from user_management.models import CustomUser
+
+
+def make_consignor(email="consignor@example.com"):
+    return CustomUser.objects.create_user(
+        email=email, password=None, username=email, user_type="consignor"
+    )
+
+
+def make_carriers(count, prefix="carrier"):
+    return CustomUser.objects.bulk_create([
+        CustomUser(
+            email=f"{prefix}{i}@example.com",
+            username=f"{prefix}{i}",
+            user_type="carrier",
+            vehicle_capacity_kg=Decimal("5000"),
+            base_rate_per_km=Decimal("80"),
+            current_latitude=27.7,
+            current_longitude=85.3,
+        )
+        for i in range(count)
+    ])
+
+
+def make_load(consignor, **kwargs):
+    fields = {
+        "consignor": consignor,
+        "name": "Kathmandu to Pokhara",
+        "description": "Boxes",
+        "pickup_address": "Kathmandu",
+        "pickup_latitude": 27.7172,
+        "pickup_longitude": 85.3240,
+        "destination_address": "Pokhara",
+        "destination_latitude": 28.2096,
+        "destination_longitude": 83.9856,
+        "weight": Decimal("500"),
+        "scheduled_date": date.today() + timedelta(days=2),
+        **kwargs,
+    }
+    return Load.objects.create(**fields)
+
+
+@skipUnless(connection.vendor == "postgresql", "Needs concurrent writers (PostgreSQL).")
+class ConcurrentBookingTests(TransactionTestCase):
+    """
+    Many carriers booking the same load at once: the conditional UPDATE in
+    book_load must let exactly one through, and losers must fail fast.
+    """
+    attempts = 300
+    # Threads (and so database connections) in flight; below max_connections.
+    concurrency = 50
+    # Upper bound on any single attempt, connection setup included.
+    max_attempt_seconds = 5.0
+
+    def test_exactly_one_booking_wins(self):
+        load = make_load(make_consignor())
+        carriers = make_carriers(self.attempts)
+        start = threading.Barrier(self.concurrency)
+
+        def attempt(carrier):
+            try:
+                try:
+                    start.wait(timeout=10)
+                except threading.BrokenBarrierError:
+                    pass  # Only the first wave starts together.
+                started = time.perf_counter()
+                try:
+                    book_load(
+                        Load.objects.for_listing().get(pk=load.pk),
+                        carrier,
+                        PricingAlgorithm.DYNAMIC,
+                    )
+                    outcome = "booked"
+                except BookingError:
+                    outcome = "rejected"
+                return outcome, time.perf_counter() - started
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            results = list(executor.map(attempt, carriers))
+
+        outcomes = [outcome for outcome, _ in results]
+        self.assertEqual(outcomes.count("booked"), 1)
+        self.assertEqual(outcomes.count("rejected"), self.attempts - 1)
+        self.assertEqual(Booking.objects.filter(load=load).count(), 1)
+        load.refresh_from_db()
+        self.assertEqual(load.status, LoadStatus.BOOKED)
+        self.assertLess(max(seconds for _, seconds in results), self.max_attempt_seconds)
+
+
+class QueryCountTests(TestCase):
+    """
+    Pins the queries each page runs at 1 and at 500 rows of data, so a
+    per-row query (a missing select_related/only) fails here.
+
+    Every count includes the session and user lookups.
+    """
+    row_counts = (1, 500)
+    # Proximity lookups: one PostGIS query, or building the in-process
+    # pickup index plus an in_bulk() without PostGIS.
+    nearest_queries = 1 if getattr(connection.ops, "postgis", False) else 2
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.consignor = make_consignor()
+        cls.carrier = make_carriers(1)[0]
+        cls.admin = CustomUser.objects.create_superuser(
+            email="admin@example.com", password=None, username="admin"
+        )
+
+    def reset_caches(self):
+        # Counters, quotes, rendered cards and the pickup index must not carry
+        # over between measurements.
+        for cache in caches.all():
+            cache.clear()
+        spatial._pickup_index = None
+
+    def add_rows(self, count):
+        """
+        Add ``count`` pending loads and ``count`` loads booked by the carrier.
+        """
+        today = date.today()
+        loads = []
+        for i in range(count * 2):
+            load = Load(
+                consignor=self.consignor,
+                name=f"Load {i}",
+                description="Boxes",
+                pickup_address="Kathmandu",
+                pickup_latitude=27.7 + i / 10_000,
+                pickup_longitude=85.3,
+                destination_address="Pokhara",
+                destination_latitude=28.2,
+                destination_longitude=83.9 + i / 10_000,
+                weight=Decimal("500"),
+                scheduled_date=today + timedelta(days=i % 5),
+                status=LoadStatus.PENDING if i < count else LoadStatus.BOOKED,
+            )
+            # bulk_create skips Load.save(), which fills these.
+            load.pickup_point = Point(load.pickup_longitude, load.pickup_latitude, srid=4326)
+            load.destination_point = Point(
+                load.destination_longitude, load.destination_latitude, srid=4326
+            )
+            loads.append(load)
+        Load.objects.bulk_create(loads)
+        Booking.objects.bulk_create([
+            Booking(load=load, carrier=self.carrier, price=Decimal("1000"))
+            for load in loads[count:]
+        ])
+
+    def pages(self):
+        """
+        ``(name, user, url, expected queries)`` for every page under test.
+        """
+        load = Load.objects.pending().order_by("created_at").first()
+        return [
+            ("my loads", self.consignor, reverse("my_loads"), 3),
+            ("load form", self.consignor, reverse("load_create"), 2),
+            ("my loads export", self.consignor, reverse("export_my_loads"), 3),
+            ("load detail (consignor)", self.consignor, reverse("load_detail", args=[load.pk]), 3),
+            # + market count and the page.
+            ("available loads", self.carrier, reverse("available_loads"), 4),
+            (
+                "available loads near me",
+                self.carrier,
+                reverse("available_loads") + "?near=1",
+                3 + self.nearest_queries,
+            ),
+            # + load, market count and one chain level's proximity lookup.
+            (
+                "load detail (carrier)",
+                self.carrier,
+                reverse("load_detail", args=[load.pk]),
+                3 + self.nearest_queries,
+            ),
+            ("my bookings", self.carrier, reverse("my_bookings"), 3),
+            ("my bookings export", self.carrier, reverse("export_my_bookings"), 3),
+            ("loads API", self.carrier, reverse("api_loads"), 4),
+            ("load detail API", self.carrier, reverse("api_load_detail", args=[load.pk]), 4),
+            ("bookings API", self.carrier, reverse("api_bookings"), 3),
+            (
+                "recommendations API",
+                self.carrier,
+                reverse("api_recommendations"),
+                3 + self.nearest_queries,
+            ),
+            # + two counts (filtered and total) and the page.
+            ("load changelist", self.admin, reverse("admin:logistics_load_changelist"), 7),
+            ("booking changelist", self.admin, reverse("admin:logistics_booking_changelist"), 7),
+        ]
+
+    def test_query_counts_do_not_grow_with_rows(self):
+        added = 0
+        for rows in self.row_counts:
+            self.add_rows(rows - added)
+            added = rows
+            for name, user, url, expected in self.pages():
+                with self.subTest(page=name, rows=rows):
+                    self.reset_caches()
+                    self.client.force_login(user)
+                    with self.assertNumQueries(expected):
+                        response = self.client.get(url)
+                        if response.streaming:
+                            b"".join(response.streaming_content)
+                    self.assertEqual(response.status_code, 200)
+
+
+class IndexUsageTests(TestCase):
+    """
+    EXPLAIN the marketplace's list queries over enough rows for the planner to
+    prefer an index, and check each one names the index added for it.
+    """
+    loads_count = 10_000
+
+    @classmethod
+    def setUpTestData(cls):
+        consignors = [make_consignor(f"consignor{i}@example.com") for i in range(50)]
+        carriers = make_carriers(100)
+        today = date.today()
+        loads = Load.objects.bulk_create([
+            Load(
+                consignor=consignors[i % len(consignors)],
+                name=f"Load {i}",
+                description="Boxes",
+                pickup_address="Kathmandu",
+                destination_address="Pokhara",
+                weight=Decimal("500"),
+                scheduled_date=today + timedelta(days=i % 365),
+                status=LoadStatus.BOOKED if i % 2 else LoadStatus.PENDING,
+            )
+            for i in range(cls.loads_count)
+        ])
+        Booking.objects.bulk_create([
+            Booking(load=load, carrier=carriers[i % len(carriers)], price=Decimal("1000"))
+            for i, load in enumerate(loads)
+            if load.status == LoadStatus.BOOKED
+        ])
+        cls.consignor = consignors[0]
+        cls.carrier = carriers[0]
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("ANALYZE logistics_load")
+                cursor.execute("ANALYZE logistics_booking")
+
+    def assertUsesIndex(self, queryset, index_name):
+        # The index name shows up in both PostgreSQL's EXPLAIN and SQLite's
+        # EXPLAIN QUERY PLAN output.
+        plan = queryset.explain()
+        self.assertIn(index_name, plan, plan)
+
+    def test_available_loads_use_partial_pending_index(self):
+        queryset = Load.objects.pending().for_listing().order_by("-created_at", "-pk")
+        self.assertUsesIndex(queryset[:DEFAULT_PAGE_SIZE + 1], "load_pending_created_idx")
+
+    def test_my_loads_use_consignor_index(self):
+        queryset = (
+            Load.objects.filter(consignor=self.consignor)
+            .select_related("booking")
+            .order_by("-created_at")
+        )
+        self.assertUsesIndex(queryset, "load_consignor_created_idx")
+
+    def test_my_bookings_use_carrier_index(self):
+        queryset = (
+            Booking.objects.filter(carrier=self.carrier)
+            .select_related("load")
+            .order_by("-booked_at")
+        )
+        self.assertUsesIndex(queryset, "booking_carrier_booked_idx")
+
+    def test_admin_status_filter_uses_status_index(self):
+        queryset = Load.objects.filter(status=LoadStatus.BOOKED).order_by("-created_at")
+        self.assertUsesIndex(queryset[:100], "load_status_created_idx")
+
+    def test_admin_date_filter_uses_scheduled_date_index(self):
+        start = date.today() + timedelta(days=30)
+        queryset = Load.objects.filter(
+            scheduled_date__gte=start, scheduled_date__lt=start + timedelta(days=7)
+        )
+        self.assertUsesIndex(queryset[:100], "load_scheduled_date_idx")
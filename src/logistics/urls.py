@@ -1,23 +1,46 @@
+from django.conf import settings
 from django.urls import path
+from .api import LoadDetailAPIView, LoadListAPIView, MyBookingsAPIView, RecommendedLoadsAPIView
 from .views import (
     MyLoadsListView,
     LoadCreateView,
     AvailableLoadsListView,
     LoadDetailView,
     BookLoadView,
-    MyBookingsListView
+    BulkBookLoadsView,
+    LoadFeedView,
+    MyBookingsListView,
+    MyBookingsExportView,
+    MyLoadsExportView,
 )
 
+if settings.LOGISTICS_ASYNC_VIEWS:
+    from .async_views import (
+        AsyncAvailableLoadsView as AvailableLoadsListView,
+        AsyncBookLoadView as BookLoadView,
+        AsyncLoadDetailView as LoadDetailView,
+    )
+
 urlpatterns = [
     # Consignor URLs
     path('my-loads/', MyLoadsListView.as_view(), name='my_loads'),
     path('loads/create/', LoadCreateView.as_view(), name='load_create'),
+    path('my-loads/export/', MyLoadsExportView.as_view(), name='export_my_loads'),
     
     # Carrier URLs
     path('loads/available/', AvailableLoadsListView.as_view(), name='available_loads'),
-    path('loads/<int:pk>/book/', BookLoadView.as_view(), name='book_load'),
+    path('loads/<uuid:pk>/book/', BookLoadView.as_view(), name='book_load'),
+    path('loads/book/bulk/', BulkBookLoadsView.as_view(), name='bulk_book_loads'),
     path('my-bookings/', MyBookingsListView.as_view(), name='my_bookings'),
+    path('my-bookings/export/', MyBookingsExportView.as_view(), name='export_my_bookings'),
+    path('loads/feed/', LoadFeedView.as_view(), name='load_feed'),
+
+    # JSON API (carriers)
+    path('api/loads/', LoadListAPIView.as_view(), name='api_loads'),
+    path('api/loads/<uuid:pk>/', LoadDetailAPIView.as_view(), name='api_load_detail'),
+    path('api/bookings/', MyBookingsAPIView.as_view(), name='api_bookings'),
+    path('api/recommendations/', RecommendedLoadsAPIView.as_view(), name='api_recommendations'),
 
     # Common URL
-    path('loads/<int:pk>/', LoadDetailView.as_view(), name='load_detail'),
+    path('loads/<uuid:pk>/', LoadDetailView.as_view(), name='load_detail'),
 ]
\ No newline at end of file
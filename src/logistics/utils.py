@@ -13,13 +13,18 @@ class BookingStatus(models.TextChoices):
     CANCELLED = 'CANCELLED', 'Cancelled'
 
 
+class PricingAlgorithm(models.TextChoices):
+    DYNAMIC = "dynamic", "Dynamic (market/urgency)"
+    DISTANCE = "distance", "Location (haversine)"
+    WEIGHT = "weight", "Vehicle weight fit"
+
+
 # --- Pricing helpers ---------------------------------------------------------
 # These helpers stay in utils so they can be reused by views, forms, and admin.
 
 from math import radians, sin, cos, sqrt, atan2
 from datetime import date
 
-
 def haversine_distance_km(lat1, lon1, lat2, lon2):
     """
     Compute haversine distance in KM between two coordinate pairs.
@@ -37,6 +42,17 @@ def haversine_distance_km(lat1, lon1, lat2, lon2):
     return round(earth_radius_km * c, 2)
 
 
+# dynamic_pricing's demand surge saturates at this many active loads.
+SURGE_SATURATION_LOADS = 10
+
+
+def surge_bucket(active_loads_count):
+    """
+    Collapse an active-load count to the values that change dynamic pricing.
+    """
+    return min(active_loads_count, SURGE_SATURATION_LOADS)
+
+
 def dynamic_pricing(load, carrier, active_loads_count=0):
     """
     Dynamic pricing that considers base cost + load weight + market surge.
@@ -62,13 +78,16 @@ def dynamic_pricing(load, carrier, active_loads_count=0):
 def location_pricing(load, carrier, default_rate_per_km=90):
     """
     Location/distance pricing using haversine distance and carrier's rate.
+    Uses the distance stored on the load when available.
     """
-    distance_km = haversine_distance_km(
-        load.pickup_latitude,
-        load.pickup_longitude,
-        load.destination_latitude,
-        load.destination_longitude,
-    )
+    distance_km = getattr(load, "route_distance_km", None)
+    if distance_km is None:
+        distance_km = haversine_distance_km(
+            load.pickup_latitude,
+            load.pickup_longitude,
+            load.destination_latitude,
+            load.destination_longitude,
+        )
     if distance_km is None:
         return None, None
 
@@ -96,26 +115,3 @@ def weight_class_pricing(load, carrier):
 
     base = 150 + weight * 6
     return round(base * multiplier, 2)
-
-
-def pricing_options(load, carrier, active_loads_count=0):
-    """
-    Return a dictionary of pricing strategies for easy rendering.
-    """
-    dynamic_price = dynamic_pricing(load, carrier, active_loads_count)
-    distance_price, distance_km = location_pricing(load, carrier)
-    weight_price = weight_class_pricing(load, carrier)
-
-    return {
-        "dynamic": {"label": "Dynamic (market + urgency)", "price": dynamic_price},
-        "distance": {
-            "label": "Location (haversine)",
-            "price": distance_price,
-            "distance_km": distance_km,
-        },
-        "weight": {
-            "label": "Vehicle Weight Fit",
-            "price": weight_price,
-            "capacity": getattr(carrier, "vehicle_capacity_kg", None),
-        },
-    }
@@ -1,16 +1,39 @@
 # logistics/views.py
 
+import asyncio
+import json
+from datetime import date
+from uuid import UUID
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import PermissionDenied
+from django.core.serializers.json import DjangoJSONEncoder
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.middleware.csrf import get_token
 from django.shortcuts import get_object_or_404, redirect
+from django.template.loader import render_to_string
 from django.urls import reverse_lazy
+from django.utils.html import format_html
+from django.utils.safestring import mark_safe
 from django.views.generic import ListView, CreateView, DetailView, View
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib import messages
-from django.db import transaction
-from logistics.utils import BookingStatus, LoadStatus, pricing_options
+from logistics.utils import BookingStatus, LoadStatus, surge_bucket
 from .models import Load, Booking, PricingAlgorithm
 
 from .models import Load, Booking
+from .chaining import plan_chains
+from .events import get_broker
+from .exports import BOOKING_EXPORT_FIELDS, LOAD_EXPORT_FIELDS, export_response
 from .forms import LoadForm
+from .market import pending_load_count
+from .pagination import DEFAULT_PAGE_SIZE, keyset_paginate
+from .pricing import get_strategy, pricing_carrier_key
+from .quotes import get_quotes, get_quotes_batch, sign_quotes
+from .services import BookingError, book_load, book_loads_bulk
+from .spatial import nearest_pending_loads
 from .mixins import ConsignorRequiredMixin, CarrierRequiredMixin
 
 # --- Views for Consignors ---
@@ -24,7 +47,11 @@ class MyLoadsListView(LoginRequiredMixin, ConsignorRequiredMixin, ListView):
     context_object_name = 'loads'
 
     def get_queryset(self):
-        return Load.objects.filter(consignor=self.request.user).order_by('-created_at')
+        return (
+            Load.objects.filter(consignor=self.request.user)
+            .select_related('booking')
+            .order_by('-created_at')
+        )
 
 class LoadCreateView(LoginRequiredMixin, ConsignorRequiredMixin, CreateView):
     """
@@ -42,28 +69,111 @@ class LoadCreateView(LoginRequiredMixin, ConsignorRequiredMixin, CreateView):
 
 # --- Views for Carriers ---
 
+LOAD_CARD_CACHE_ALIAS = "fragments"
+LOAD_CARD_TEMPLATE = "logistics/load_card.html"
+CSRF_PLACEHOLDER = "<!--csrf-token-->"
+
+def build_load_cards(loads, carrier, active_count):
+    """
+    Pair each load with its pricing options for the listing templates.
+    """
+    prices = get_quotes_batch(loads, carrier, active_count)
+    return [
+        {"load": load, "prices": sign_quotes(load, carrier, load_prices)}
+        for load, load_prices in zip(loads, prices)
+    ]
+
+
+def load_card_cache_key(load, carrier, active_count):
+    """
+    Everything a rendered card depends on. Booking or editing a load bumps
+    its updated_at, so the card's key changes with it.
+    """
+    pickup_distance = getattr(load, "pickup_distance", None)
+    return ":".join([
+        "load-card",
+        str(load.pk),
+        str(load.updated_at.timestamp()),
+        str(carrier.pk),
+        *pricing_carrier_key(carrier),
+        str(surge_bucket(active_count)),
+        date.today().isoformat(),
+        f"{pickup_distance.km:.1f}" if pickup_distance is not None else "-",
+    ])
+
+
+def render_load_cards(request, loads, carrier, active_count):
+    """
+    Rendered load cards for the listing, served from the fragment cache.
+    Only cards missing from the cache are priced and rendered.
+    """
+    cache = caches[LOAD_CARD_CACHE_ALIAS]
+    keys = [load_card_cache_key(load, carrier, active_count) for load in loads]
+    rendered = cache.get_many(keys)
+
+    missing = [(key, load) for key, load in zip(keys, loads) if key not in rendered]
+    if missing:
+        cards = build_load_cards([load for _, load in missing], carrier, active_count)
+        fresh = {
+            key: render_to_string(LOAD_CARD_TEMPLATE, card)
+            for (key, _), card in zip(missing, cards)
+        }
+        cache.set_many(fresh)
+        rendered.update(fresh)
+
+    # Cards are shared between the carrier's sessions, so the CSRF input is
+    # added per request rather than cached.
+    csrf_input = format_html(
+        '<input type="hidden" name="csrfmiddlewaretoken" value="{}">', get_token(request)
+    )
+    return [
+        {"load": load, "html": mark_safe(rendered[key].replace(CSRF_PLACEHOLDER, csrf_input))}
+        for key, load in zip(keys, loads)
+    ]
+
 class AvailableLoadsListView(LoginRequiredMixin, CarrierRequiredMixin, ListView):
     """
-    Displays all available loads (status='PENDING') for carriers to book.
+    Displays available loads (status='PENDING') for carriers to book,
+    one keyset page at a time so pricing only runs for the visible rows.
     """
     model = Load
     template_name = 'logistics/available_loads.html'
     context_object_name = 'loads'
-    
+    page_size = DEFAULT_PAGE_SIZE
+
     def get_queryset(self):
-        return Load.objects.filter(status=LoadStatus.PENDING).order_by('-created_at')
+        return Load.objects.pending().for_listing().order_by('-created_at')
+
+    def get_nearby_origin(self):
+        """
+        Carrier position for the "near me" listing, or None when not requested/known.
+        """
+        user = self.request.user
+        if self.request.GET.get("near") != "1":
+            return None
+        if user.current_latitude is None or user.current_longitude is None:
+            return None
+        return user.current_latitude, user.current_longitude
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        active_loads = self.get_queryset()
-        active_count = active_loads.count()
-        load_cards = []
-        for load in active_loads:
-            load_cards.append({
-                "load": load,
-                "prices": pricing_options(load, self.request.user, active_count)
-            })
-        context["load_cards"] = load_cards
+        cursor = self.request.GET.get("cursor")
+        origin = self.get_nearby_origin()
+        if origin:
+            loads = nearest_pending_loads(
+                *origin, limit=self.page_size, radius_km=settings.NEARBY_LOADS_RADIUS_KM
+            )
+            next_cursor = None
+        else:
+            loads, next_cursor = keyset_paginate(self.object_list, cursor, self.page_size)
+        context[self.context_object_name] = loads
+        context["load_cards"] = render_load_cards(
+            self.request, loads, self.request.user, pending_load_count()
+        )
+        context["next_cursor"] = next_cursor
+        context["is_first_page"] = not cursor
+        context["near_me"] = origin is not None
+        context["load_feed_enabled"] = settings.LOAD_FEED_ENABLED
         return context
 
 class LoadDetailView(LoginRequiredMixin, DetailView):
@@ -74,12 +184,18 @@ class LoadDetailView(LoginRequiredMixin, DetailView):
     template_name = 'logistics/load_detail.html'
     context_object_name = 'load'
 
+    def get_queryset(self):
+        return Load.objects.select_related('consignor')
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        load = self.get_object()
+        load = self.object
         if getattr(self.request.user, "user_type", None) == "carrier":
-            active_count = Load.objects.filter(status=LoadStatus.PENDING).count()
-            context["price_options"] = pricing_options(load, self.request.user, active_count)
+            active_count = pending_load_count()
+            prices = get_quotes(load, self.request.user, active_count)
+            context["price_options"] = sign_quotes(load, self.request.user, prices)
+            if load.status == LoadStatus.PENDING:
+                context["chains"] = plan_chains(self.request.user, load)
         return context
 
 
@@ -88,48 +204,127 @@ class BookLoadView(LoginRequiredMixin, CarrierRequiredMixin, View):
     Handles the logic for a carrier to book a load.
     """
     def post(self, request, *args, **kwargs):
-        load_id = self.kwargs.get('pk')
-        load = get_object_or_404(Load, id=load_id)
+        load = get_object_or_404(Load.objects.for_listing(), pk=self.kwargs.get('pk'))
         selected_algo = request.POST.get("algorithm", PricingAlgorithm.DYNAMIC)
 
-        if load.status != LoadStatus.PENDING:
-            messages.error(request, "This load is no longer available.")
+        try:
+            quote_token = request.POST.get(f"quote_{selected_algo}")
+            booking = book_load(load, request.user, selected_algo, quote_token)
+        except BookingError as e:
+            messages.error(request, str(e))
             return redirect('available_loads')
 
-        # Prevent duplicate booking attempts
-        if hasattr(load, "booking"):
-            messages.error(request, "This load has already been booked.")
-            return redirect('available_loads')
+        messages.success(
+            request,
+            f"You have successfully booked the load: {load.name} "
+            f"using {get_strategy(selected_algo).label} for NPR {booking.price}.",
+        )
+        return redirect('my_bookings')
 
-        active_count = Load.objects.filter(status=LoadStatus.PENDING).count()
-        price_data = pricing_options(load, request.user, active_count).get(selected_algo)
-        if not price_data or price_data.get("price") is None:
-            messages.error(request, "Unable to calculate price for the selected algorithm.")
-            return redirect('available_loads')
 
+class BulkBookLoadsView(LoginRequiredMixin, CarrierRequiredMixin, View):
+    """
+    Books many loads at once for fleet carriers and returns a JSON report.
+
+    Accepts either a JSON body ``{"loads": [{"id": <uuid>, "algorithm": <key>}]}``
+    or form fields ``load_ids`` plus ``algorithm_<uuid>`` per load.
+    """
+    def get_selections(self, request):
+        """
+        Map of raw load id to algorithm key; raises ValueError when the body
+        is not shaped as documented above.
+        """
+        if request.content_type == "application/json":
+            payload = json.loads(request.body or b"{}")
+            items = payload.get("loads", []) if isinstance(payload, dict) else None
+            if not isinstance(items, list):
+                raise ValueError("loads must be a list.")
+            selections = {}
+            for item in items:
+                if not isinstance(item, dict):
+                    raise ValueError("Each load must be an object.")
+                load_id = item.get("id")
+                algorithm = item.get("algorithm", PricingAlgorithm.DYNAMIC)
+                if not isinstance(load_id, str) or not isinstance(algorithm, str):
+                    raise ValueError("Load id and algorithm must be strings.")
+                selections[load_id] = algorithm
+            return selections
+        return {
+            load_id: request.POST.get(f"algorithm_{load_id}", PricingAlgorithm.DYNAMIC)
+            for load_id in request.POST.getlist("load_ids")
+        }
+
+    def post(self, request, *args, **kwargs):
         try:
-            # Use a transaction to ensure both operations succeed or fail together
-            with transaction.atomic():
-                Booking.objects.create(
-                    load=load,
-                    carrier=request.user,
-                    selected_algorithm=selected_algo,
-                    price=price_data.get("price"),
-                    distance_km=price_data.get("distance_km"),
-                )
-                # Update the load status
-                load.status = LoadStatus.BOOKED
-                load.save()
-            
-            messages.success(
-                request,
-                f"You have successfully booked the load: {load.name} "
-                f"using {PricingAlgorithm(selected_algo).label} for NPR {price_data.get('price')}.",
-            )
-        except Exception as e:
-            messages.error(request, f"An error occurred while booking. Please try again. Error: {e}")
-        
-        return redirect('my_bookings')
+            raw_selections = self.get_selections(request)
+        except ValueError:
+            return JsonResponse({"error": "Malformed request body."}, status=400)
+
+        selections = {}
+        for load_id, algorithm in raw_selections.items():
+            try:
+                selections[UUID(str(load_id))] = algorithm
+            except ValueError:
+                continue
+
+        try:
+            report = book_loads_bulk(request.user, selections)
+        except BookingError as e:
+            return JsonResponse({"error": str(e)}, status=400)
+
+        results = []
+        for load_id in raw_selections:
+            try:
+                outcome = report[UUID(str(load_id))]
+            except (ValueError, KeyError):
+                outcome = {"booked": False, "error": "Invalid load id."}
+            results.append({"id": str(load_id), **outcome})
+        return JsonResponse({
+            "booked": sum(1 for result in results if result["booked"]),
+            "results": results,
+        })
+
+
+class LoadFeedView(View):
+    """
+    Server-Sent Events stream of load created/booked/cancelled events.
+    Served by the ASGI app, an idle carrier costs one held connection
+    instead of repeated listing queries.
+
+    WSGI drains an async streaming body before sending it, so on an endless
+    feed it would hold a worker forever. The feed is only served with
+    LOAD_FEED_ENABLED under ASGI; otherwise 204 tells EventSource to stop
+    reconnecting.
+    """
+    async def get(self, request, *args, **kwargs):
+        if not settings.LOAD_FEED_ENABLED or not isinstance(request, ASGIRequest):
+            return HttpResponse(status=204)
+
+        user = await request.auser()
+        if not user.is_authenticated or user.user_type != 'carrier':
+            raise PermissionDenied("You must be a carrier to access this page.")
+
+        response = StreamingHttpResponse(self.stream(), content_type="text/event-stream")
+        response["Cache-Control"] = "no-cache"
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+    async def stream(self):
+        subscription = get_broker().subscribe()
+        try:
+            yield "retry: 5000\n\n"
+            while True:
+                try:
+                    event = await asyncio.wait_for(
+                        subscription.get(), timeout=settings.LOAD_FEED_HEARTBEAT_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                data = json.dumps(event, cls=DjangoJSONEncoder)
+                yield f"event: {event['type']}\ndata: {data}\n\n"
+        finally:
+            subscription.close()
 
 
 class MyBookingsListView(LoginRequiredMixin, CarrierRequiredMixin, ListView):
@@ -142,3 +337,21 @@ class MyBookingsListView(LoginRequiredMixin, CarrierRequiredMixin, ListView):
 
     def get_queryset(self):
         return Booking.objects.filter(carrier=self.request.user).select_related('load').order_by('-booked_at')
+
+
+class MyLoadsExportView(LoginRequiredMixin, ConsignorRequiredMixin, View):
+    """
+    Streams the consignor's loads, with their bookings, as CSV or NDJSON (``?format=ndjson``).
+    """
+    def get(self, request, *args, **kwargs):
+        queryset = Load.objects.filter(consignor=request.user).order_by('created_at')
+        return export_response(queryset, LOAD_EXPORT_FIELDS, request.GET.get("format"), "loads")
+
+
+class MyBookingsExportView(LoginRequiredMixin, CarrierRequiredMixin, View):
+    """
+    Streams the carrier's bookings as CSV or NDJSON (``?format=ndjson``).
+    """
+    def get(self, request, *args, **kwargs):
+        queryset = Booking.objects.filter(carrier=request.user).order_by('booked_at')
+        return export_response(queryset, BOOKING_EXPORT_FIELDS, request.GET.get("format"), "bookings")
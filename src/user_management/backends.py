@@ -1,25 +1,105 @@
+from django.conf import settings
 from django.contrib.auth.backends import ModelBackend
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
 
 UserModel = get_user_model()
 
+# Columns kept in the cached user snapshot: what role checks, pricing and
+# the base template read on every request. Everything else stays deferred.
+SNAPSHOT_FIELDS = (
+    "uuid",
+    "email",
+    "username",
+    "user_type",
+    "is_active",
+    "is_staff",
+    "is_superuser",
+    "profile_pic",
+    "vehicle_capacity_kg",
+    "base_rate_per_km",
+    "current_latitude",
+    "current_longitude",
+)
+
+
+def user_snapshot_key(user_id):
+    return f"user-snapshot:{user_id}"
+
+
+def invalidate_user_snapshot(user_id):
+    cache.delete(user_snapshot_key(user_id))
+
+
+def _user_from_snapshot(snapshot):
+    field_names = [
+        field.attname for field in UserModel._meta.concrete_fields if field.attname in snapshot
+    ]
+    return UserModel.from_db(
+        DEFAULT_DB_ALIAS, field_names, [snapshot[name] for name in field_names]
+    )
+
+
 class EmailBackend(ModelBackend):
     """
     Authenticate using email instead of username.
+
+    The email is matched case-insensitively with one query served by the
+    Upper(email) index. When ``user_type`` is given, accounts of another type
+    are rejected, but only after the password hash is checked so the response
+    time does not reveal which type an address is registered as.
     """
-    def authenticate(self, request, username=None, password=None, **kwargs):
+    def authenticate(self, request, username=None, password=None, user_type=None, **kwargs):
         # Accept both "username" and "email" keys
         email = kwargs.get("email", username)
 
         if email is None or password is None:
             return None
 
-        try:
-            user = UserModel.objects.get(email=email)
-        except UserModel.DoesNotExist:
+        users = list(UserModel._default_manager.filter(email__iexact=email)[:2])
+        if len(users) > 1:
+            # Addresses differing only in case predate case-insensitive login.
+            users = [user for user in users if user.email == email]
+        if len(users) != 1:
+            # Run the hasher once to reduce the timing difference between
+            # an existing and a nonexistent user (see ModelBackend).
+            UserModel().set_password(password)
+            return None
+
+        user = users[0]
+        if not user.check_password(password) or not self.user_can_authenticate(user):
+            return None
+        if user_type is not None and user.user_type != user_type:
             return None
+        return user
 
-        if user.check_password(password) and self.user_can_authenticate(user):
-            return user
-        return None
+    def get_user(self, user_id):
+        """
+        With USER_SNAPSHOT_CACHE on, build the session's user from a cached
+        snapshot of SNAPSHOT_FIELDS plus its session auth hash instead of
+        loading the full row. Snapshots are dropped whenever the user is saved,
+        which settings only allow when the default cache is shared.
+        """
+        if not settings.USER_SNAPSHOT_CACHE:
+            return super().get_user(user_id)
 
+        key = user_snapshot_key(user_id)
+        snapshot = cache.get(key)
+        if snapshot is None:
+            row = (
+                UserModel._default_manager.filter(pk=user_id)
+                .values(*SNAPSHOT_FIELDS, "password")
+                .first()
+            )
+            if row is None:
+                return None
+            password = row.pop("password")
+            user = _user_from_snapshot(row)
+            user.password = password
+            snapshot = {**row, "session_auth_hash": user.get_session_auth_hash()}
+            cache.set(key, snapshot, settings.USER_SNAPSHOT_TTL)
+        else:
+            user = _user_from_snapshot(snapshot)
+        user._session_auth_hash = snapshot["session_auth_hash"]
+        return user if self.user_can_authenticate(user) else None
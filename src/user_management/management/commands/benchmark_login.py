@@ -0,0 +1,76 @@
+import time
+
+from django.contrib.auth import authenticate
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
+
+from user_management.models import CustomUser
+
+# Hashers whose cost is negligible, to expose the lookup cost (--fast-hasher).
+FAST_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure authenticate() throughput and queries per login against a table of "
+        "synthetic users. The users are created in a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=10_000)
+        parser.add_argument("--logins", type=int, default=50, help="Logins timed per scenario.")
+        parser.add_argument(
+            "--fast-hasher",
+            action="store_true",
+            help="Hash with MD5 so the email lookup dominates the timings.",
+        )
+
+    def handle(self, *args, **options):
+        hashers = FAST_HASHERS if options["fast_hasher"] else None
+        with override_settings(**({"PASSWORD_HASHERS": hashers} if hashers else {})):
+            try:
+                with transaction.atomic():
+                    self.run(options["users"], options["logins"])
+                    raise Rollback
+            except Rollback:
+                pass
+
+    def run(self, users_count, logins):
+        password = make_password("benchmark-password")
+        CustomUser.objects.bulk_create(
+            [
+                CustomUser(
+                    email=f"Benchmark.User{i}@Example.com",
+                    username=f"benchmark-user-{i}",
+                    user_type="carrier" if i % 2 else "consignor",
+                    password=password,
+                )
+                for i in range(users_count)
+            ],
+            batch_size=2000,
+        )
+
+        scenarios = {
+            "valid login": ("benchmark.user1@example.com", "benchmark-password", "carrier"),
+            "wrong user type": ("benchmark.user1@example.com", "benchmark-password", "consignor"),
+            "wrong password": ("benchmark.user1@example.com", "wrong-password", "carrier"),
+            "unknown email": ("nobody@example.com", "benchmark-password", "carrier"),
+        }
+        self.stdout.write(f"{users_count} users, {logins} logins per scenario:")
+        for label, (email, password, user_type) in scenarios.items():
+            with CaptureQueriesContext(connection) as queries:
+                started = time.perf_counter()
+                for _ in range(logins):
+                    authenticate(None, email=email, password=password, user_type=user_type)
+                elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f"  {label}: {logins / elapsed:.1f} logins/s, "
+                f"{elapsed / logins * 1000:.1f}ms each, "
+                f"{len(queries) / logins:.1f} queries each."
+            )
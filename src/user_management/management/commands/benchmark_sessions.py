@@ -0,0 +1,69 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+
+from user_management.models import CustomUser
+
+ENGINES = {
+    "db": "django.contrib.sessions.backends.db",
+    "cached_db": "django.contrib.sessions.backends.cached_db",
+    "signed_cookies": "django.contrib.sessions.backends.signed_cookies",
+    "cache": "django.contrib.sessions.backends.cache",
+}
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure per-request latency and queries of a logged-in page under each session "
+        "engine. The test user is created in a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--engines", nargs="+", choices=list(ENGINES), default=list(ENGINES))
+        parser.add_argument("--requests", type=int, default=200)
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                user = CustomUser.objects.create_user(
+                    email="session-benchmark@example.com",
+                    password=None,
+                    username="session-benchmark",
+                    user_type="carrier",
+                )
+                for engine in options["engines"]:
+                    self.measure(engine, user, options["requests"])
+                raise Rollback
+        except Rollback:
+            pass
+
+    def measure(self, engine, user, requests):
+        with override_settings(
+            SESSION_ENGINE=ENGINES[engine],
+            ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"],
+        ):
+            client = Client()
+            client.force_login(user)
+            path = reverse("my_bookings")
+            client.get(path)  # warm the session cache and URL resolver
+
+            with CaptureQueriesContext(connection) as queries:
+                started = time.perf_counter()
+                for _ in range(requests):
+                    client.get(path)
+                elapsed = time.perf_counter() - started
+            session_queries = sum("django_session" in query["sql"] for query in queries)
+            self.stdout.write(
+                f"{engine}: {elapsed / requests * 1000:.2f}ms per request, "
+                f"{len(queries) / requests:.1f} queries per request "
+                f"({session_queries / requests:.1f} on django_session)."
+            )
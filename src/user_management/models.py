@@ -2,6 +2,7 @@ import uuid
 from django.conf import settings
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.db.models.functions import Upper
 from django.core.validators import RegexValidator
 
 from user_management.manager import CustomUserManager
@@ -44,9 +45,22 @@ class CustomUser(AbstractUser):
 
     objects = CustomUserManager()
 
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            # Serves EmailBackend's email__iexact lookup (UPPER(email) on PostgreSQL).
+            models.Index(Upper("email"), name="user_email_upper_idx"),
+        ]
+
     def __str__(self):
         return self.email
 
+    def get_session_auth_hash(self):
+        # Users built from a cached snapshot (EmailBackend.get_user) carry the
+        # hash instead of the password; a password set since is hashed afresh.
+        if hasattr(self, "_session_auth_hash") and "password" in self.get_deferred_fields():
+            return self._session_auth_hash
+        return super().get_session_auth_hash()
+
 class UserStamp(models.Model):
     created_by = models.ForeignKey(
         settings.AUTH_USER_MODEL,
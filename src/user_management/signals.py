@@ -0,0 +1,15 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from user_management.backends import invalidate_user_snapshot
+
+
+@receiver(post_save, sender=get_user_model())
+@receiver(post_delete, sender=get_user_model())
+def invalidate_user_snapshot_on_change(sender, instance, **kwargs):
+    pk = instance.pk
+    invalidate_user_snapshot(pk)
+    # Drop it again after commit in case a request re-cached the old row meanwhile.
+    transaction.on_commit(lambda: invalidate_user_snapshot(pk))
@@ -38,18 +38,15 @@ class LoginView(FormView):
         password = form.cleaned_data['password']
         user_type = form.cleaned_data['user_type']
 
-        # Attempt to authenticate the user
-        user = authenticate(self.request, email=email, password=password)
+        # EmailBackend checks the account type only after the password hash, so a
+        # wrong type takes as long to reject as a wrong password.
+        user = authenticate(self.request, email=email, password=password, user_type=user_type)
 
         if user is not None:
-            if hasattr(user, 'user_type') and user.user_type == user_type:
-                login(self.request, user)
-                return super().form_valid(form)
-            else:
-                form.add_error(None, "User type mismatch.")
-        else:
-            form.add_error(None, "Invalid email or password.")
-        
+            login(self.request, user)
+            return super().form_valid(form)
+
+        form.add_error(None, "Invalid email, password or user type.")
         return self.form_invalid(form)
 
     def dispatch(self, request, *args, **kwargs):
@@ -78,7 +75,11 @@ class ProfileUpdateView(LoginRequiredMixin, UpdateView):
     success_url = reverse_lazy('profile')
 
     def get_object(self, queryset=None):
-        return self.request.user
+        user = self.request.user
+        if user.get_deferred_fields():
+            # A cached snapshot user; the form needs every profile field.
+            user = CustomUser.objects.get(pk=user.pk)
+        return user
 
     def form_valid(self, form):
         user = form.save(commit=False)